@@ -1,12 +1,21 @@
 #!/bin/bash
 set -e
 
+# Shared mount profile (also used by Jellyfin's mount); exported so the
+# organiser picks up its LISTING_SNAPSHOT settings too
+if [ -f /rclone/mount.env ]; then
+    set -a
+    . /rclone/mount.env
+    set +a
+fi
+
 echo "Starting rclone mount..."
 rclone mount zurg: /zurg \
     --config /rclone/rclone.conf \
     --allow-other \
     --allow-non-empty \
-    --dir-cache-time 10s \
+    --dir-cache-time "${RCLONE_DIR_CACHE_TIME:-10s}" \
+    --attr-timeout "${RCLONE_ATTR_TIMEOUT:-1s}" \
     --vfs-cache-mode off \
     --daemon
 
@@ -19,20 +19,98 @@ Environment variables:
   SCAN_INTERVAL_SECS  — seconds between scans (default: 300)
   POCKETBASE_URL      — PocketBase API URL (default: http://pocketbase:8090)
   REBUILD_MODE        — set to "true" to rebuild symlinks from DB and exit
+  REBUILD_FROM        — "pocketbase" (default) or "snapshot" (the library
+                        snapshot written after every scan); rebuilding from
+                        PocketBase falls back to the snapshot if it is empty
+  RESEED_MODE         — set to "true" to restore PocketBase from the library
+                        snapshot and exit
+  TMDB_CACHE_TTL_DAYS — days before a cached TMDb record is revalidated (default: 30)
+  TMDB_REFRESH_PER_SCAN — max stale TMDb records revalidated per scan (default: 50)
+  TMDB_EXPORT_DIR     — directory holding TMDb daily ID exports to import
+                        (default: /app/data/tmdb_exports)
+  FUZZY_MATCH_THRESHOLD — min confidence for a local fuzzy title match (default: 0.85)
+  FUZZY_YEAR_WINDOW   — years either side a fuzzy match may differ by (default: 1)
+  ASYNC_SCAN          — set to "true" to run scans on the asyncio core
+  ASYNC_FS_WORKERS    — max concurrent filesystem operations in async mode; the
+                        adaptive mount limiter works up to it (default: 8)
+  ASYNC_TMDB_CONCURRENCY — concurrent TMDb requests in async mode (default: 4)
+  ASYNC_PB_CONCURRENCY — concurrent PocketBase requests in async mode (default: 8)
+  ASYNC_FS_TIMEOUT_SECS — per-operation filesystem timeout in async mode (default: 120)
+  POCKETBASE_RETRIES  — retries per PocketBase request on transient errors (default: 3)
+  POCKETBASE_BREAKER_RESET_SECS — seconds before probing a down PocketBase again (default: 30)
+  POCKETBASE_STARTUP_WAIT_SECS — how long startup waits for PocketBase (default: 10)
+  LISTING_SNAPSHOT    — set to "true" to reuse unchanged torrent directories'
+                        listings from the persistent snapshot (set by the
+                        shared mount profile, /rclone/mount.env)
+  LISTING_SNAPSHOT_MAX_AGE_SECS — re-list a directory at least this often (default: 3600)
+  MOUNT_PROBE_TIMEOUT_SECS — mount probe listing / first-byte timeout (default: 30)
+  MOUNT_SLOW_MS       — a mount operation slower than this halves the adaptive
+                        mount concurrency and doubles the pause between
+                        operations (default: 2000)
+  MOUNT_PAUSE_MAX_MS  — longest pause between mount operations (default: 5000)
+  JELLYFIN_URL        — Jellyfin, polled for active playback (default:
+                        http://jellyfin:8096; needs JELLYFIN_API_KEY)
+  JELLYFIN_API_KEY    — API key used to ask Jellyfin whether anyone is watching
+  PLAYBACK_ACTIVE_FILE — while this file exists, playback counts as active
+                        too (default: unset)
+  PLAYBACK_CONCURRENCY — mount concurrency while playback is active (default: 1)
+  PLAYBACK_PAUSE_MS   — pause before each mount operation while playback is
+                        active (default: 200)
+  SCAN_BUDGET_SECS    — time budget for parsing/resolving per scan; work past it
+                        is carried over to the next scan (default: 240, 0 = none)
+  VERIFY_PER_SCAN     — unchanged sources re-verified per scan (default: 200)
+  RECENT_ACTIVITY_DAYS — shows with a file added this recently are re-verified
+                        first (default: 7)
+  CHECKPOINT_INTERVAL_SECS — how often a scan saves its progress, so a crashed
+                        scan resumes where it stopped (default: 60)
+  OUTPUT_PROFILES     — extra symlink trees built from the same scan, as a JSON
+                        list of {"name", "root", "min_score", "max_score",
+                        "select"}; select is "best" (default), "worst" or
+                        "smallest" (smallest file). Example:
+                        [{"name": "lite", "root": "/media/profiles/lite",
+                          "max_score": 140, "select": "smallest"}]
+  LISTING_RECORD_FILE — record each scan's discovered listing (paths, sizes,
+                        mtimes) to this file, overwriting the previous scan's
+  LISTING_RECORD_TMDB — include the known TMDb records in recordings (default: true)
+  LISTING_RECORD_ANONYMISE — replace title words in recorded names and TMDb
+                        records with consistent pseudo-words (default: false)
+  LISTING_REPLAY_FILE — replay a recording instead of reading the mount: runs
+                        LISTING_REPLAY_SCANS scan(s) offline and exits
+  LISTING_REPLAY_DIR  — scratch directory for a replay's state, caches and
+                        symlinks (default: a new temporary directory)
+  LISTING_REPLAY_SCANS — scans to run against the recording (default: 1)
   PUID / PGID         — not used directly (symlinks don't have ownership issues)
 """
 
+import asyncio
+import gc
+import gzip
+import hashlib
 import json
 import logging
 import os
+import random
 import re
+import resource
+import sqlite3
+import struct
 import sys
+import tempfile
+import threading
 import time
+import unicodedata
+import zlib
+from collections import ChainMap, Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import NamedTuple
 from urllib.parse import quote
 
 import requests
-from guessit import guessit
+
+# Monotonic time at import, for the cold-start measurement logged by main()
+STARTED_AT = time.monotonic()
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -40,7 +118,26 @@ from guessit import guessit
 
 ZURG_MOUNT = Path("/zurg")
 MEDIA_DIR = Path("/media")
-STATE_FILE = Path("/app/data/state.json")
+DATA_DIR = Path("/app/data")
+
+# A listing replay (see below) keeps its state, caches and symlinks in a
+# scratch directory, away from the live library
+LISTING_REPLAY_FILE = os.environ.get("LISTING_REPLAY_FILE", "")
+if LISTING_REPLAY_FILE:
+    LISTING_REPLAY_DIR = Path(os.environ.get("LISTING_REPLAY_DIR")
+                              or tempfile.mkdtemp(prefix="organiser-replay-"))
+    MEDIA_DIR = LISTING_REPLAY_DIR / "media"
+    DATA_DIR = LISTING_REPLAY_DIR / "data"
+
+STATE_FILE = DATA_DIR / "state.json"
+TMDB_CACHE_FILE = DATA_DIR / "tmdb_cache.json"
+TMDB_INDEX_FILE = DATA_DIR / "tmdb_index.sqlite"
+PB_QUEUE_FILE = DATA_DIR / "pb_queue.jsonl"
+LISTING_SNAPSHOT_FILE = DATA_DIR / "listing_snapshot.json"
+MOUNT_HEALTH_FILE = DATA_DIR / "mount_health.json"
+LIBRARY_SNAPSHOT_FILE = DATA_DIR / "library.snap"
+SCAN_CHECKPOINT_FILE = DATA_DIR / "scan_checkpoint.json"
+TMDB_EXPORT_DIR = Path(os.environ.get("TMDB_EXPORT_DIR", DATA_DIR / "tmdb_exports"))
 
 # The path where the Zurg mount appears inside Jellyfin's container.
 JELLYFIN_ZURG_PATH = Path(os.environ.get("JELLYFIN_ZURG_PATH", "/zurg"))
@@ -51,13 +148,68 @@ SHOWS_DIR = MEDIA_DIR / "shows"
 ZURG_FILMS = ZURG_MOUNT / "films"
 ZURG_SHOWS = ZURG_MOUNT / "shows"
 
-TMDB_API_KEY = os.environ.get("TMDB_API_KEY", "")
+# Extra output trees (JSON; parsed into output_profiles once logging is set up)
+OUTPUT_PROFILES = os.environ.get("OUTPUT_PROFILES", "")
+
+# Record / replay of mount listings (for reproducing slow scans offline)
+LISTING_RECORD_FILE = os.environ.get("LISTING_RECORD_FILE", "")
+LISTING_RECORD_TMDB = os.environ.get("LISTING_RECORD_TMDB", "true").lower() == "true"
+LISTING_RECORD_ANONYMISE = os.environ.get("LISTING_RECORD_ANONYMISE", "").lower() == "true"
+LISTING_REPLAY_SCANS = int(os.environ.get("LISTING_REPLAY_SCANS", "1"))
+
+# A replay runs offline: titles resolve from the recorded TMDb records only
+TMDB_API_KEY = "" if LISTING_REPLAY_FILE else os.environ.get("TMDB_API_KEY", "")
 SCAN_INTERVAL = int(os.environ.get("SCAN_INTERVAL_SECS", "300"))
 
 POCKETBASE_URL = os.environ.get("POCKETBASE_URL", "http://pocketbase:8090")
 REBUILD_MODE = os.environ.get("REBUILD_MODE", "").lower() == "true"
+REBUILD_FROM = os.environ.get("REBUILD_FROM", "pocketbase").lower()
+RESEED_MODE = os.environ.get("RESEED_MODE", "").lower() == "true"
+
+# PocketBase resilience: retries with jittered backoff, a circuit breaker,
+# and a durable queue for writes made while PocketBase is down
+PB_RETRIES = int(os.environ.get("POCKETBASE_RETRIES", "3"))
+PB_BACKOFF_BASE = 0.25  # seconds; doubles per attempt, full jitter
+PB_BACKOFF_CAP = 5.0
+PB_BREAKER_THRESHOLD = 5  # consecutive failed requests before the circuit opens
+PB_BREAKER_RESET = float(os.environ.get("POCKETBASE_BREAKER_RESET_SECS", "30"))
+PB_STARTUP_WAIT = int(os.environ.get("POCKETBASE_STARTUP_WAIT_SECS", "10"))
+PB_QUEUE_BATCH = 200
+PB_QUEUE_MAX_ATTEMPTS = 5
+
+ASYNC_SCAN = os.environ.get("ASYNC_SCAN", "").lower() == "true"
+ASYNC_FS_WORKERS = int(os.environ.get("ASYNC_FS_WORKERS", "8"))
+ASYNC_TMDB_CONCURRENCY = int(os.environ.get("ASYNC_TMDB_CONCURRENCY", "4"))
+ASYNC_PB_CONCURRENCY = int(os.environ.get("ASYNC_PB_CONCURRENCY", "8"))
+ASYNC_FS_TIMEOUT = int(os.environ.get("ASYNC_FS_TIMEOUT_SECS", "120"))
+
+LISTING_SNAPSHOT = os.environ.get("LISTING_SNAPSHOT", "").lower() == "true"
+LISTING_SNAPSHOT_MAX_AGE = int(os.environ.get("LISTING_SNAPSHOT_MAX_AGE_SECS", "3600"))
+MOUNT_PROBE_TIMEOUT = int(os.environ.get("MOUNT_PROBE_TIMEOUT_SECS", "30"))
+MOUNT_SLOW = int(os.environ.get("MOUNT_SLOW_MS", "2000")) / 1000
+MOUNT_PAUSE_MAX = int(os.environ.get("MOUNT_PAUSE_MAX_MS", "5000")) / 1000
+MOUNT_PAUSE_MIN = 0.05  # first pause after a slow or failed mount operation
+JELLYFIN_URL = os.environ.get("JELLYFIN_URL", "http://jellyfin:8096").rstrip("/")
+JELLYFIN_API_KEY = os.environ.get("JELLYFIN_API_KEY", "")
+PLAYBACK_ACTIVE_FILE = os.environ.get("PLAYBACK_ACTIVE_FILE", "")
+PLAYBACK_CONCURRENCY = int(os.environ.get("PLAYBACK_CONCURRENCY", "1"))
+PLAYBACK_PAUSE = int(os.environ.get("PLAYBACK_PAUSE_MS", "200")) / 1000
+PLAYBACK_CHECK_INTERVAL = 5  # seconds between playback checks
+
+# Scan scheduling: new/changed files first, then background re-verification
+SCAN_BUDGET = int(os.environ.get("SCAN_BUDGET_SECS", "240"))
+VERIFY_PER_SCAN = int(os.environ.get("VERIFY_PER_SCAN", "200"))
+RECENT_ACTIVITY_DAYS = int(os.environ.get("RECENT_ACTIVITY_DAYS", "7"))
+CHECKPOINT_INTERVAL = int(os.environ.get("CHECKPOINT_INTERVAL_SECS", "60"))
 
 TMDB_BASE = "https://api.themoviedb.org/3"
+TMDB_CACHE_TTL = int(os.environ.get("TMDB_CACHE_TTL_DAYS", "30")) * 86400
+TMDB_REFRESH_PER_SCAN = int(os.environ.get("TMDB_REFRESH_PER_SCAN", "50"))
+TMDB_MISS_TTL = 6 * 3600  # don't re-query a title TMDb had no match for
+
+FUZZY_MATCH_THRESHOLD = float(os.environ.get("FUZZY_MATCH_THRESHOLD", "0.85"))
+FUZZY_YEAR_WINDOW = int(os.environ.get("FUZZY_YEAR_WINDOW", "1"))
+FUZZY_MIN_LEAD = 0.05  # a fuzzy match must beat the next-best title by this much
 
 VIDEO_EXTENSIONS = {
     ".mkv", ".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm",
@@ -117,6 +269,30 @@ ATMOS_BONUS = 10       # Dolby Atmos / DTS:X
 LOSSLESS_AUDIO_BONUS = 8  # DTS-HD MA, TrueHD, FLAC, PCM
 
 
+_guessit = None
+
+
+def guessit(name: str, options: dict | None = None):
+    """guessit, imported on first use.
+
+    Importing guessit and building its rebulk rules is the slowest and most
+    memory-hungry part of startup, and rebuild mode never parses a name, so
+    it is only paid when something actually needs parsing. The first call
+    waits for the background warm-up, if one is running, instead of racing
+    it to build the same rules.
+    """
+    global _guessit
+    if _guessit is None:
+        warmup.join("guessit")
+        from guessit import guessit as _guessit
+    return _guessit(name, options)
+
+
+def _warm_guessit():
+    from guessit import guessit as parse
+    parse("Warm.Up.2000.1080p.WEB.mkv")
+
+
 def score_quality(name: str) -> int:
     """Score a torrent/file name by quality. Higher = better."""
     guess = guessit(name)
@@ -186,17 +362,85 @@ logging.basicConfig(
 log = logging.getLogger("organiser")
 
 
+def _pooled_session(pool_size: int) -> requests.Session:
+    """A requests session keeping up to pool_size keep-alive connections per host."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 # ---------------------------------------------------------------------------
 # PocketBase client
 # ---------------------------------------------------------------------------
 
+class PocketBaseUnavailable(Exception):
+    """PocketBase is down, failing, or the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling a service after repeated failures, then probes it again.
+
+    After `threshold` consecutive failed attempts the breaker opens and every call
+    fails fast. Once `reset_after` seconds have passed a single probe call is
+    let through (half-open); success closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, name: str, threshold: int, reset_after: float):
+        self.name = name
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self._opened_at >= self.reset_after:
+                self._probing = True
+                return True
+            return False
+
+    def success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                log.info(f"{self.name} is back — circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold):
+                if self._opened_at is None:
+                    log.warning(f"{self.name} unavailable — circuit open, "
+                                f"retrying in {self.reset_after:.0f}s")
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
 class PocketBaseClient:
-    """Lightweight PocketBase REST API client for the organiser."""
+    """Lightweight PocketBase REST API client for the organiser.
+
+    Every request goes through _request, which retries transient failures
+    with jittered exponential backoff and trips a circuit breaker when
+    PocketBase stays down, so callers fail fast instead of hanging.
+    """
 
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip("/")
         self.api = f"{self.base_url}/api"
-        self._session = requests.Session()
+        self._session = _pooled_session(ASYNC_PB_CONCURRENCY)
+        self.breaker = CircuitBreaker("PocketBase", PB_BREAKER_THRESHOLD, PB_BREAKER_RESET)
 
     def _url(self, collection: str, record_id: str = "") -> str:
         url = f"{self.api}/collections/{collection}/records"
@@ -204,24 +448,56 @@ class PocketBaseClient:
             url += f"/{record_id}"
         return url
 
-    # --- TMDB collection ---
-
-    def get_tmdb(self, tmdb_id: int, media_type: str) -> dict | None:
-        """Look up a canonical TMDB record by tmdb_id and type."""
-        try:
-            filt = f'tmdb_id = {tmdb_id} && type = "{media_type}"'
-            resp = self._session.get(
-                self._url("tmdb"),
-                params={"filter": filt, "perPage": 1},
-                timeout=5,
-            )
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying 5xx/429/connection errors with backoff.
+
+        Raises PocketBaseUnavailable when retries are exhausted or the
+        breaker is open, and requests.HTTPError for other 4xx responses
+        (PocketBase is up; the request itself was rejected).
+        """
+        if not self.breaker.allow():
+            raise PocketBaseUnavailable(f"{method} {url}: circuit open")
+        kwargs.setdefault("timeout", 5)
+        error: object = None
+        for attempt in range(PB_RETRIES + 1):
+            if attempt:
+                # Every failed attempt counts towards the breaker, so a dead
+                # PocketBase stops the retries within a request or two
+                if not self.breaker.allow():
+                    break
+                time.sleep(random.uniform(0, min(PB_BACKOFF_CAP, PB_BACKOFF_BASE * 2 ** attempt)))
+            try:
+                resp = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                self.breaker.failure()
+                continue
+            if resp.status_code >= 500 or resp.status_code == 429:
+                error = f"HTTP {resp.status_code}"
+                self.breaker.failure()
+                continue
+            self.breaker.success()
             resp.raise_for_status()
-            items = resp.json().get("items", [])
-            if items:
-                return items[0]
-        except Exception as e:
-            log.debug(f"PocketBase tmdb query failed: {e}")
-        return None
+            return resp
+        raise PocketBaseUnavailable(f"{method} {url}: {error}")
+
+    def _first(self, collection: str, filt: str) -> dict | None:
+        resp = self._request("GET", self._url(collection), params={"filter": filt, "perPage": 1})
+        items = resp.json().get("items", [])
+        return items[0] if items else None
+
+    def _upsert(self, collection: str, filt: str, data: dict) -> dict:
+        """Create or update the record matching filt; unchanged records are not rewritten."""
+        existing = self._first(collection, filt)
+        if existing and all(existing.get(k) == v for k, v in data.items()):
+            return existing
+        if existing:
+            resp = self._request("PATCH", self._url(collection, existing["id"]), json=data)
+        else:
+            resp = self._request("POST", self._url(collection), json=data)
+        return resp.json()
+
+    # --- TMDB collection ---
 
     def upsert_tmdb(self, tmdb_id: int, media_type: str,
                     title: str, year: int | None) -> dict | None:
@@ -233,69 +509,33 @@ class PocketBaseClient:
             "year": year or 0,
         }
         try:
-            existing = self.get_tmdb(tmdb_id, media_type)
-            if existing:
-                resp = self._session.patch(
-                    self._url("tmdb", existing["id"]),
-                    json=data,
-                    timeout=5,
-                )
-            else:
-                resp = self._session.post(self._url("tmdb"), json=data, timeout=5)
-            resp.raise_for_status()
-            return resp.json()
+            return self._upsert("tmdb", f'tmdb_id = {tmdb_id} && type = "{media_type}"', data)
         except Exception as e:
             log.debug(f"PocketBase upsert tmdb failed: {e}")
         return None
 
     # --- Films collection ---
 
-    def get_film(self, source_path: str) -> dict | None:
-        """Look up a film record by source path."""
-        try:
-            filt = f'source_path = "{self._escape(source_path)}"'
-            resp = self._session.get(
-                self._url("films"),
-                params={"filter": filt, "perPage": 1},
-                timeout=5,
-            )
-            resp.raise_for_status()
-            items = resp.json().get("items", [])
-            if items:
-                return items[0]
-        except Exception as e:
-            log.debug(f"PocketBase films query failed: {e}")
-        return None
-
     def upsert_film(self, source_path: str, target_path: str,
-                    tmdb_row_id: str, score: int = 0) -> dict | None:
+                    tmdb_row_id: str, score: int = 0,
+                    fingerprint: str = "") -> dict | None:
         """Create or update a film record."""
         data = {
             "source_path": source_path,
             "target_path": target_path,
             "tmdb": tmdb_row_id,
             "score": score,
+            "fingerprint": fingerprint,
         }
         try:
-            existing = self.get_film(source_path)
-            if existing:
-                resp = self._session.patch(
-                    self._url("films", existing["id"]), json=data, timeout=5,
-                )
-            else:
-                resp = self._session.post(self._url("films"), json=data, timeout=5)
-            resp.raise_for_status()
-            return resp.json()
+            return self._upsert("films", f'source_path = "{self._escape(source_path)}"', data)
         except Exception as e:
             log.debug(f"PocketBase upsert film failed: {e}")
         return None
 
-    def delete_film(self, record_id: str):
-        """Delete a film record by PocketBase row ID."""
-        try:
-            self._session.delete(self._url("films", record_id), timeout=5).raise_for_status()
-        except Exception as e:
-            log.debug(f"PocketBase delete film failed: {e}")
+    def list_all_tmdb(self) -> list[dict]:
+        """Fetch all canonical TMDB records (paginated)."""
+        return self._paginate("tmdb")
 
     def list_all_films(self) -> list[dict]:
         """Fetch all film records (paginated), expanding the tmdb relation."""
@@ -303,26 +543,10 @@ class PocketBaseClient:
 
     # --- Shows collection ---
 
-    def get_show(self, source_path: str) -> dict | None:
-        """Look up a show record by source path."""
-        try:
-            filt = f'source_path = "{self._escape(source_path)}"'
-            resp = self._session.get(
-                self._url("shows"),
-                params={"filter": filt, "perPage": 1},
-                timeout=5,
-            )
-            resp.raise_for_status()
-            items = resp.json().get("items", [])
-            if items:
-                return items[0]
-        except Exception as e:
-            log.debug(f"PocketBase shows query failed: {e}")
-        return None
-
     def upsert_show(self, source_path: str, target_path: str,
                     tmdb_row_id: str, season: int | None = None,
-                    episode: int | None = None) -> dict | None:
+                    episode: int | None = None,
+                    fingerprint: str = "") -> dict | None:
         """Create or update a show record."""
         data = {
             "source_path": source_path,
@@ -330,34 +554,66 @@ class PocketBaseClient:
             "tmdb": tmdb_row_id,
             "season": season or 0,
             "episode": episode or 0,
+            "fingerprint": fingerprint,
         }
         try:
-            existing = self.get_show(source_path)
-            if existing:
-                resp = self._session.patch(
-                    self._url("shows", existing["id"]), json=data, timeout=5,
-                )
-            else:
-                resp = self._session.post(self._url("shows"), json=data, timeout=5)
-            resp.raise_for_status()
-            return resp.json()
+            return self._upsert("shows", f'source_path = "{self._escape(source_path)}"', data)
         except Exception as e:
             log.debug(f"PocketBase upsert show failed: {e}")
         return None
 
-    def delete_show(self, record_id: str):
-        """Delete a show record by PocketBase row ID."""
-        try:
-            self._session.delete(self._url("shows", record_id), timeout=5).raise_for_status()
-        except Exception as e:
-            log.debug(f"PocketBase delete show failed: {e}")
-
     def list_all_shows(self) -> list[dict]:
         """Fetch all show records (paginated), expanding the tmdb relation."""
         return self._paginate("shows", expand="tmdb")
 
+    def delete_by_source(self, collection: str, source_path: str) -> bool:
+        """Delete the record for source_path if there is one; False if PocketBase failed."""
+        try:
+            item = self._first(collection, f'source_path = "{self._escape(source_path)}"')
+            if item:
+                self._request("DELETE", self._url(collection, item["id"]))
+            return True
+        except Exception as e:
+            log.debug(f"PocketBase delete from {collection} failed: {e}")
+        return False
+
+    def delete_record(self, collection: str, record_id: str) -> bool:
+        """Delete a record by PocketBase row ID; False if PocketBase failed."""
+        try:
+            self._request("DELETE", self._url(collection, record_id))
+            return True
+        except requests.HTTPError as e:
+            # Already gone is as good as deleted
+            if e.response is not None and e.response.status_code == 404:
+                return True
+            log.debug(f"PocketBase delete from {collection} failed: {e}")
+        except Exception as e:
+            log.debug(f"PocketBase delete from {collection} failed: {e}")
+        return False
+
+    # --- Indexed library queries (see the add_query_indexes migration) ---
+
+    def sources_for_target(self, collection: str, target_path: str) -> list[dict] | None:
+        """Mappings whose symlink is target_path; None if PocketBase failed."""
+        try:
+            resp = self._request("GET", self._url(collection), params={
+                "filter": f'target_path = "{self._escape(target_path)}"', "perPage": 50})
+            return resp.json().get("items", [])
+        except Exception as e:
+            log.debug(f"PocketBase {collection} target query failed: {e}")
+        return None
+
     # --- Helpers ---
 
+    def count(self, collection: str) -> int | None:
+        """Number of records in a collection; None if PocketBase failed."""
+        try:
+            resp = self._request("GET", self._url(collection), params={"perPage": 1, "fields": "id"})
+            return resp.json().get("totalItems")
+        except Exception as e:
+            log.debug(f"PocketBase count {collection} failed: {e}")
+        return None
+
     def _paginate(self, collection: str, expand: str = "") -> list[dict]:
         items = []
         page = 1
@@ -367,8 +623,7 @@ class PocketBaseClient:
         while True:
             try:
                 params["page"] = page
-                resp = self._session.get(self._url(collection), params=params, timeout=10)
-                resp.raise_for_status()
+                resp = self._request("GET", self._url(collection), params=params, timeout=10)
                 data = resp.json()
                 items.extend(data.get("items", []))
                 if page >= data.get("totalPages", 1):
@@ -380,12 +635,15 @@ class PocketBaseClient:
         return items
 
     def health_check(self) -> bool:
-        """Check if PocketBase is reachable."""
+        """Check if PocketBase is reachable (bypasses retries; closes the breaker)."""
         try:
             resp = self._session.get(f"{self.base_url}/api/health", timeout=5)
-            return resp.status_code == 200
         except Exception:
             return False
+        if resp.status_code == 200:
+            self.breaker.success()
+            return True
+        return False
 
     @staticmethod
     def _escape(value: str) -> str:
@@ -393,57 +651,687 @@ class PocketBaseClient:
         return value.replace("\\", "\\\\").replace('"', '\\"')
 
 
-# Global PocketBase client
-pb = PocketBaseClient(POCKETBASE_URL)
+class WriteQueue:
+    """Durable JSON-lines queue of PocketBase writes that could not be applied.
+
+    Failed writes are appended and fsynced a batch at a time, and whatever is
+    left is flushed before the scan's state is saved, so a crash or restart
+    never loses a write the saved state relies on. They are replayed in
+    order once PocketBase is reachable.
+    The sources and targets of queued writes are counted, so a new write can
+    tell whether it has to wait behind one of them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._ops: list[dict] | None = None
+        self._unsynced: list[dict] = []
+        self._keys: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _item_keys(item: dict) -> list[str]:
+        entry = item["entry"]
+        return [item["source"], entry["target"]] if entry else [item["source"]]
+
+    def _load(self) -> list[dict]:
+        if self._ops is None:
+            self._ops = []
+            if self.path.exists():
+                for line in self.path.read_text().splitlines():
+                    try:
+                        self._ops.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        log.warning("Skipping corrupt line in PocketBase write queue")
+            for item in self._ops:
+                self._keys.update(self._item_keys(item))
+        return self._ops
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def blocks(self, source: str, target: str | None = None) -> bool:
+        """Whether a queued write for this source or onto this target is pending."""
+        with self._lock:
+            self._load()
+            return self._keys[source] > 0 or bool(target and self._keys[target] > 0)
+
+    def push(self, op: str, source: str, entry: dict | None = None):
+        item = {"op": op, "source": source, "entry": entry, "attempts": 0}
+        with self._lock:
+            self._load().append(item)
+            self._keys.update(self._item_keys(item))
+            self._unsynced.append(item)
+            if len(self._unsynced) >= PB_QUEUE_BATCH:
+                self._append_unsynced()
+
+    def flush(self):
+        """Append and fsync the writes pushed since the last batch."""
+        with self._lock:
+            self._append_unsynced()
+
+    def _append_unsynced(self):
+        if not self._unsynced:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write("".join(json.dumps(item) + "\n" for item in self._unsynced))
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsynced.clear()
+
+    def replay(self, apply, batch_size: int) -> int:
+        """Apply queued writes oldest-first in batches; return how many were applied.
+
+        Stops as soon as PocketBase goes away again. A write that keeps
+        failing while PocketBase is up is dropped after PB_QUEUE_MAX_ATTEMPTS.
+        """
+        applied = 0
+        with self._lock:
+            ops = self._load()
+            pending, kept = list(ops), []
+            while pending and not pb.breaker.is_open:
+                batch, pending = pending[:batch_size], pending[batch_size:]
+                for item in batch:
+                    if not pb.breaker.is_open and apply(item["op"], item["source"], item["entry"]):
+                        applied += 1
+                        continue
+                    if not pb.breaker.is_open:
+                        # Rejected while PocketBase is up — not a transient failure
+                        item["attempts"] += 1
+                        if item["attempts"] >= PB_QUEUE_MAX_ATTEMPTS:
+                            log.warning(f"Dropping PocketBase {item['op']} for {item['source']} "
+                                        f"after {item['attempts']} attempts")
+                            continue
+                    kept.append(item)
+                # Persist progress after every batch
+                self._rewrite(kept + pending)
+                self._unsynced.clear()
+            ops[:] = kept + pending
+            self._keys = Counter(key for item in ops for key in self._item_keys(item))
+        return applied
+
+    def _rewrite(self, ops: list[dict]):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text("".join(json.dumps(item) + "\n" for item in ops))
+        tmp.replace(self.path)
+
+
+class OfflinePocketBase(PocketBaseClient):
+    """Stands in for PocketBase during a listing replay.
+
+    Every request fails at once, as if PocketBase were down, so a replay
+    neither reads nor changes the real library database.
+    """
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        raise PocketBaseUnavailable(f"{method} {url}: offline (listing replay)")
+
+    def health_check(self) -> bool:
+        return False
+
+
+# Global PocketBase client and its durable write queue
+pb = OfflinePocketBase(POCKETBASE_URL) if LISTING_REPLAY_FILE else PocketBaseClient(POCKETBASE_URL)
+pb_queue = WriteQueue(PB_QUEUE_FILE)
+
+
+# ---------------------------------------------------------------------------
+# TMDb metadata cache (local, with TTL + ETag revalidation)
+# ---------------------------------------------------------------------------
+
+class TmdbCache:
+    """Local cache of canonical TMDb records, keyed on type + tmdb_id.
+
+    Each record keeps the canonical title/year, when it was last fetched from
+    TMDb (``fetched_at``), the ETag TMDb sent with it, and the PocketBase row
+    it was last written to. PocketBase is only written when the canonical
+    title or year actually changes.
+    """
+
+    def __init__(self, path: Path, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self._records: dict[str, dict] | None = None
+
+    @staticmethod
+    def _key(media_type: str, tmdb_id: int) -> str:
+        return f"{media_type}:{tmdb_id}"
+
+    @property
+    def records(self) -> dict[str, dict]:
+        if self._records is None:
+            self._records = {}
+            if self.path.exists():
+                try:
+                    self._records = json.loads(self.path.read_text())
+                except (json.JSONDecodeError, OSError):
+                    log.warning("Corrupt TMDb cache file, starting fresh")
+        return self._records
+
+    def save(self):
+        """Persist the cache to disk (no-op if it was never loaded)."""
+        if self._records is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Saved mid-scan too: never leave a half-written cache behind, and
+        # snapshot first since the async core's lookup threads may be adding
+        records = {key: dict(rec) for key, rec in dict(self._records).items()}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(records))
+        tmp.replace(self.path)
+
+    def get(self, media_type: str, tmdb_id: int) -> dict | None:
+        return self.records.get(self._key(media_type, tmdb_id))
+
+    def put(self, media_type: str, tmdb_id: int, title: str,
+            year: int | None, etag: str | None = None,
+            fetched_at: float | None = None) -> dict:
+        """Record a TMDb result for tmdb_id (fetched now unless `fetched_at` is given)."""
+        rec = self.records.setdefault(self._key(media_type, tmdb_id), {})
+        rec.update(title=title, year=year,
+                   fetched_at=time.time() if fetched_at is None else fetched_at)
+        if etag:
+            rec["etag"] = etag
+        title_index.add(media_type, tmdb_id, title, year)
+        return rec
+
+    def seed(self, pb_record: dict):
+        """Learn a PocketBase tmdb row without treating it as freshly fetched."""
+        if not pb_record.get("id") or pb_record.get("tmdb_id") is None:
+            return
+        rec = self.records.setdefault(
+            self._key(pb_record["type"], pb_record["tmdb_id"]),
+            {"title": pb_record.get("title", ""), "year": pb_record.get("year") or None, "fetched_at": 0},
+        )
+        rec.update(pb_id=pb_record["id"], pb_title=pb_record.get("title", ""),
+                   pb_year=pb_record.get("year") or 0)
+        title_index.add(pb_record["type"], pb_record["tmdb_id"], rec["title"], rec["year"])
+
+    def stale(self, limit: int) -> list[tuple[str, int, dict]]:
+        """Return up to `limit` records older than the TTL, oldest first."""
+        cutoff = time.time() - self.ttl
+        old = [(rec.get("fetched_at", 0), key, rec)
+               for key, rec in self.records.items() if rec.get("fetched_at", 0) <= cutoff]
+        old.sort(key=lambda x: x[0])
+        result = []
+        for _, key, rec in old[:limit]:
+            media_type, tmdb_id = key.split(":", 1)
+            result.append((media_type, int(tmdb_id), rec))
+        return result
+
+    def pocketbase_id(self, media_type: str, tmdb_id: int,
+                      title: str, year: int | None) -> str | None:
+        """Return the PocketBase tmdb row id, writing the row only if it changed."""
+        rec = self.records.get(self._key(media_type, tmdb_id))
+        if rec is None:
+            # Unknown provenance (e.g. carried over from state) — revalidate later
+            rec = self.records[self._key(media_type, tmdb_id)] = {
+                "title": title, "year": year, "fetched_at": 0,
+            }
+        if (rec.get("pb_id") and rec.get("pb_title") == title
+                and rec.get("pb_year") == (year or 0)):
+            return rec["pb_id"]
+        record = pb.upsert_tmdb(tmdb_id, media_type, title, year)
+        if not record:
+            return None
+        rec.update(pb_id=record["id"], pb_title=title, pb_year=year or 0)
+        return record["id"]
+
+    def forget_pocketbase_ids(self):
+        """Drop every remembered PocketBase row, e.g. after the database was wiped.
+
+        The next write of each record upserts its tmdb row again, instead of
+        pointing new mappings at a row that no longer exists.
+        """
+        for rec in self.records.values():
+            for field in ("pb_id", "pb_title", "pb_year"):
+                rec.pop(field, None)
+
+
+# Global TMDb metadata cache
+tmdb_cache = TmdbCache(TMDB_CACHE_FILE, TMDB_CACHE_TTL)
+
+
+# ---------------------------------------------------------------------------
+# Offline TMDb index (built from TMDb's daily ID exports)
+# ---------------------------------------------------------------------------
+
+# TMDb publishes daily gzipped JSON-lines exports of every movie / TV ID:
+#   movie_ids_MM_DD_YYYY.json.gz      {"id": 603, "original_title": "The Matrix", "popularity": 78.1, ...}
+#   tv_series_ids_MM_DD_YYYY.json.gz  {"id": 1396, "original_name": "Breaking Bad", "popularity": 301.2}
+# See https://developer.themoviedb.org/docs/daily-id-exports
+TMDB_EXPORTS = {
+    "film": ("movie_ids_*.json.gz", "original_title"),
+    "show": ("tv_series_ids_*.json.gz", "original_name"),
+}
+
+
+def normalise_title(title: str) -> str:
+    """Lower-case a title and strip accents and punctuation for matching."""
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(c for c in title if not unicodedata.combining(c))
+    title = title.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^\w\s]|_", " ", title).split())
+
+
+class TmdbIndex:
+    """SQLite index of TMDb's daily ID exports for offline title lookup.
+
+    The exports only carry original titles, IDs and popularity (no release
+    year), so a lookup returns the most popular exact match on the normalised
+    title. Year and canonical title are filled in later by the TMDb refresher
+    when an API key is configured.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self, create: bool = False) -> sqlite3.Connection | None:
+        if self._conn is None:
+            if not create and not self.path.exists():
+                return None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS titles (
+                    type TEXT NOT NULL,
+                    norm TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    tmdb_id INTEGER NOT NULL,
+                    popularity REAL NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_titles_norm ON titles (type, norm, popularity DESC);
+                CREATE TABLE IF NOT EXISTS imports (
+                    name TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    rows INTEGER NOT NULL,
+                    imported_at REAL NOT NULL
+                );
+            """)
+        return self._conn
+
+    def import_export(self, path: Path, media_type: str) -> int:
+        """Replace all `media_type` rows with the contents of one export file.
+
+        The file is streamed line by line, so memory use stays flat even for
+        the ~1M-line movie export.
+        """
+        _, title_field = TMDB_EXPORTS[media_type]
+        db = self._db(create=True)
+        rows = 0
+        with db:
+            db.execute("DELETE FROM titles WHERE type = ?", (media_type,))
+            batch = []
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    title = rec.get(title_field)
+                    if not title or rec.get("adult") or rec.get("video"):
+                        continue
+                    batch.append((media_type, normalise_title(title), title,
+                                  rec["id"], rec.get("popularity") or 0))
+                    if len(batch) >= 10000:
+                        db.executemany("INSERT INTO titles VALUES (?, ?, ?, ?, ?)", batch)
+                        rows += len(batch)
+                        batch.clear()
+            db.executemany("INSERT INTO titles VALUES (?, ?, ?, ?, ?)", batch)
+            rows += len(batch)
+            db.execute("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?)",
+                       (path.name, media_type, rows, time.time()))
+        return rows
+
+    def import_new_exports(self, directory: Path) -> int:
+        """Import the newest export of each type in `directory` if not yet imported."""
+        if not directory.is_dir():
+            return 0
+        imported = 0
+        for media_type, (pattern, _) in TMDB_EXPORTS.items():
+            exports = sorted(directory.glob(pattern), key=lambda p: p.stat().st_mtime)
+            if not exports:
+                continue
+            newest = exports[-1]
+            db = self._db()
+            if db and db.execute("SELECT 1 FROM imports WHERE name = ?", (newest.name,)).fetchone():
+                continue
+            log.info(f"Importing TMDb export {newest.name}...")
+            start = time.monotonic()
+            try:
+                rows = self.import_export(newest, media_type)
+            except (OSError, EOFError, sqlite3.Error) as e:
+                log.warning(f"TMDb export import failed for {newest.name}: {e}")
+                continue
+            log.info(f"  Imported {rows} {media_type} title(s) in {time.monotonic() - start:.1f}s")
+            imported += rows
+        return imported
+
+    def lookup(self, media_type: str, title: str) -> tuple[dict | None, int]:
+        """Return (best match, number of exact matches) for a title."""
+        db = self._db()
+        if db is None:
+            return None, 0
+        try:
+            rows = db.execute(
+                "SELECT title, tmdb_id FROM titles WHERE type = ? AND norm = ? "
+                "ORDER BY popularity DESC LIMIT 5",
+                (media_type, normalise_title(title)),
+            ).fetchall()
+        except sqlite3.Error as e:
+            log.debug(f"TMDb index lookup failed for '{title}': {e}")
+            return None, 0
+        if not rows:
+            return None, 0
+        return {"title": rows[0][0], "tmdb_id": rows[0][1]}, len(rows)
+
+
+# Global offline TMDb index
+tmdb_index = TmdbIndex(TMDB_INDEX_FILE)
+
+
+# ---------------------------------------------------------------------------
+# Fuzzy title index (over every TMDb record we already know)
+# ---------------------------------------------------------------------------
+
+# Leading articles dropped before matching ("The Office" ~ "Office")
+ARTICLES = {"the", "a", "an", "le", "la", "les", "l", "el", "los", "las", "il", "lo", "gli"}
+
+# "Doctor Who 2005" / "Doctor Who (2005)" — a year glued onto the title
+TRAILING_YEAR = re.compile(r"^(.*\S)\s+\(?((?:19|20)\d{2})\)?$")
+
+# Roman numerals II–CCCXCIX as whole words ("Saw III", "Rocky IV"); a lone
+# "i" is left out since it is far more often the pronoun
+ROMAN_NUMERAL = re.compile(r"^(?!i$)c{0,3}(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})$")
+ROMAN_VALUES = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+
+
+def title_key(title: str) -> str:
+    """Normalised title with any leading article removed."""
+    words = normalise_title(title).split()
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    return " ".join(words)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _number_tokens(key: str) -> list[int]:
+    """Digit and roman-numeral words of a title key, as integers, in order.
+
+    Sequels differ from each other by little more than these, so trigram
+    similarity alone rates "Saw III" close to "Saw II".
+    """
+    numbers = []
+    for word in key.split():
+        if word.isdigit():
+            numbers.append(int(word))
+        elif ROMAN_NUMERAL.match(word):
+            values = [ROMAN_VALUES[c] for c in word]
+            numbers.append(sum(-v if v < nxt else v
+                               for v, nxt in zip(values, values[1:] + [0])))
+    return numbers
+
+
+def _title_variants(title: str, year: int | None) -> list[tuple[str, int | None]]:
+    """The parsed (title, year) plus the split-off form of a trailing year."""
+    variants = [(title, year)]
+    m = TRAILING_YEAR.match(title)
+    if m and (year is None or int(m.group(2)) == year):
+        variants.append((m.group(1), int(m.group(2))))
+    return variants
+
+
+def match_confidence(query_key: str, query_year: int | None,
+                     key: str, year: int | None) -> float:
+    """Trigram (Dice) similarity of two title keys, adjusted for year distance.
+
+    A year outside FUZZY_YEAR_WINDOW sinks the match; a missing query year
+    costs nothing, since episode names rarely carry one. Titles whose numbers
+    (digits or roman numerals) differ never match: "Part 1" is not "Part 2".
+    """
+    if _number_tokens(query_key) != _number_tokens(key):
+        return 0.0
+    a, b = _trigrams(query_key), _trigrams(key)
+    confidence = 2 * len(a & b) / (len(a) + len(b))
+    if query_year and year:
+        diff = abs(query_year - year)
+        confidence -= 0.5 if diff > FUZZY_YEAR_WINDOW else 0.05 * diff
+    elif query_year:
+        confidence -= 0.05
+    return confidence
+
+
+class TitleIndex:
+    """In-memory trigram index of canonical TMDb titles, per media type.
+
+    Built from PocketBase's tmdb collection on the first lookup that needs
+    it and kept current from the TMDb cache, so new torrents of titles we
+    already have resolve with no network call.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, int], dict] = {}
+        self._grams: dict[tuple[str, str], set[tuple[str, int]]] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, media_type: str, tmdb_id: int, title: str, year: int | None):
+        ident = (media_type, tmdb_id)
+        key = title_key(title)
+        old = self._entries.get(ident)
+        if old and old["key"] != key:
+            for g in old["grams"]:
+                self._grams.get((media_type, g), set()).discard(ident)
+        elif old:
+            old.update(title=title, year=year or None)
+            return
+        grams = _trigrams(key)
+        self._entries[ident] = {"key": key, "grams": grams, "title": title, "year": year or None}
+        for g in grams:
+            self._grams.setdefault((media_type, g), set()).add(ident)
+
+    def load(self):
+        """Index every record in PocketBase's tmdb collection and the local cache (once)."""
+        with self._lock:
+            if self.loaded:
+                return
+            for rec in pb.list_all_tmdb():
+                tmdb_cache.seed(rec)
+            for key, rec in list(tmdb_cache.records.items()):
+                media_type, tmdb_id = key.split(":", 1)
+                self.add(media_type, int(tmdb_id), rec.get("title", ""), rec.get("year"))
+            self.loaded = True
+        log.info(f"Title index: {len(self)} known TMDb title(s)")
+
+    def match(self, media_type: str, title: str,
+              year: int | None = None) -> tuple[dict, float] | None:
+        """Best known record for a parsed title, with its confidence (0–1).
+
+        None when two different titles match about equally well (e.g. "The
+        Office" 2001 and 2005 for a query with no year): which one is meant
+        is left to the API.
+        """
+        if not self.loaded:
+            self.load()
+        scores: dict[tuple[str, int], float] = {}
+        for q_title, q_year in _title_variants(title, year):
+            q_key = title_key(q_title)
+            if not q_key:
+                continue
+            grams = _trigrams(q_key)
+            shared = Counter()
+            for g in grams:
+                shared.update(self._grams.get((media_type, g), ()))
+            for ident, count in shared.items():
+                entry = self._entries[ident]
+                # Cheap upper bound before the full score
+                if 2 * count / (len(grams) + len(entry["grams"])) < FUZZY_MATCH_THRESHOLD:
+                    continue
+                conf = match_confidence(q_key, q_year, entry["key"], entry["year"])
+                scores[ident] = max(conf, scores.get(ident, conf))
+        if not scores:
+            return None
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        ident, conf = ranked[0]
+        if len(ranked) > 1 and conf - ranked[1][1] < FUZZY_MIN_LEAD:
+            log.debug(f"  Title index: {title} is ambiguous between tmdbid={ident[1]} "
+                      f"and tmdbid={ranked[1][0][1]}")
+            return None
+        entry = self._entries[ident]
+        return {"title": entry["title"], "year": entry["year"] or year, "tmdb_id": ident[1]}, conf
+
+
+# Global fuzzy title index
+title_index = TitleIndex()
 
 
 # ---------------------------------------------------------------------------
 # TMDb lookup (with PocketBase caching)
 # ---------------------------------------------------------------------------
 
+# Shared TMDb session (keep-alive connections, reused across scans and threads)
+tmdb_session = _pooled_session(ASYNC_TMDB_CONCURRENCY)
+
+
+def _release_year(date: str, fallback: int | None = None) -> int | None:
+    """Year from a TMDb YYYY-MM-DD date string, or `fallback` if missing."""
+    return int(date[:4]) if date and len(date) >= 4 else fallback
+
+
+def _local_lookup(media_type: str, title: str, year: int | None,
+                  _cache: dict | None) -> dict | None:
+    """Resolve a title against TMDb records we already know, if confident."""
+    hit = title_index.match(media_type, title, year)
+    if not hit or hit[1] < FUZZY_MATCH_THRESHOLD:
+        return None
+    result, confidence = hit
+    if _cache is not None:
+        _cache[title.lower()] = result
+    log.info(f"  TMDb local → {title} = {result['title']} ({result['year']}) "
+             f"[tmdbid={result['tmdb_id']}] {confidence:.2f}")
+    return result
+
+
+def _best_result(results: list[dict], title: str, year: int | None,
+                 title_field: str, date_field: str) -> dict | None:
+    """Pick the search result closest to the parsed title and year.
+
+    TMDb's relevance order breaks ties, so an exact match further down the
+    list beats a popular near-miss at the top.
+    """
+    best, best_conf = None, -1.0
+    q_key = title_key(title)
+    for r in results:
+        r_year = _release_year(r.get(date_field, ""))
+        conf = max(
+            match_confidence(q_key, year, title_key(r.get(field) or ""), r_year)
+            for field in (title_field, f"original_{title_field}")
+        )
+        if conf > best_conf:
+            best, best_conf = r, conf
+    return best
+
+
+# Titles TMDb had no match for, by (type, lowercased title) → time of the miss
+_tmdb_misses: dict[tuple[str, str], float] = {}
+
+
+def _search_variants(title: str, year: int | None) -> list[tuple[str, int | None]]:
+    """Queries to try in order: as parsed, trailing year split off, no year."""
+    variants = _title_variants(title, year)
+    if year:
+        variants.append((title, None))
+    return variants
+
+
+def _offline_lookup(media_type: str, title: str, year: int | None,
+                    _cache: dict | None) -> dict | None:
+    """Resolve a title from the offline TMDb index, without any API call.
+
+    The exports carry no year, so when a year is known and an API key is
+    configured a hit is only a candidate: it is accepted if the TMDb cache
+    already knows its year and that agrees, and otherwise left to the API
+    search (which does use the year) to confirm or correct.
+    """
+    match, count = tmdb_index.lookup(media_type, title)
+    if not match:
+        return None
+
+    cached = tmdb_cache.get(media_type, match["tmdb_id"])
+    if year and TMDB_API_KEY:
+        confirmed = (count == 1 and cached and cached.get("year")
+                     and abs(cached["year"] - year) <= FUZZY_YEAR_WINDOW)
+        if not confirmed:
+            return None
+    if cached:
+        result = {"title": cached["title"], "year": cached["year"] or year,
+                  "tmdb_id": match["tmdb_id"]}
+    else:
+        result = {"title": match["title"], "year": year, "tmdb_id": match["tmdb_id"]}
+        # Never fetched from the API — let the refresher fill in the details
+        tmdb_cache.put(media_type, match["tmdb_id"], result["title"], year, fetched_at=0)
+    if _cache is not None:
+        _cache[title.lower()] = result
+    log.info(f"  TMDb offline → {title} = {result['title']} ({result['year']}) [tmdbid={result['tmdb_id']}]")
+    return result
+
+
 def tmdb_search_film(title: str, year: int | None = None,
                      _cache: dict | None = None) -> dict | None:
     """Search TMDb for a film, return {title, year, tmdb_id} or None.
 
     Checks the in-memory cache first (keyed on parsed title, per scan cycle),
-    then queries the TMDb API. On a hit the result is persisted to PocketBase
-    (upserted by tmdb_id + type so it is never duplicated).
+    then the fuzzy index of known titles and the offline export index, then
+    queries the TMDb API (retrying with the year split off or dropped). On a
+    hit the result is recorded in the local TMDb cache; the PocketBase row is
+    written when the film is recorded.
     """
     if _cache is not None and title.lower() in _cache:
         return _cache[title.lower()]
 
-    # No persistent pre-lookup by title — go straight to TMDb API
+    local = _local_lookup("film", title, year, _cache) or _offline_lookup("film", title, year, _cache)
+    if local:
+        return local
+
     if not TMDB_API_KEY:
         return None
+    if time.time() - _tmdb_misses.get(("film", title.lower()), 0) < TMDB_MISS_TTL:
+        return None
 
-    params = {"api_key": TMDB_API_KEY, "query": title}
-    if year:
-        params["year"] = year
-    try:
-        resp = requests.get(f"{TMDB_BASE}/search/movie", params=params, timeout=10)
-        resp.raise_for_status()
-        results = resp.json().get("results", [])
-        if results:
-            r = results[0]
-            release = r.get("release_date", "")
+    for query, query_year in _search_variants(title, year):
+        params = {"api_key": TMDB_API_KEY, "query": query}
+        if query_year:
+            params["year"] = query_year
+        try:
+            resp = tmdb_session.get(f"{TMDB_BASE}/search/movie", params=params, timeout=10)
+            resp.raise_for_status()
+            results = resp.json().get("results", [])
+        except Exception as e:
+            log.debug(f"TMDb film search failed for '{query}': {e}")
+            return None
+        r = _best_result(results, query, query_year, "title", "release_date")
+        if r:
             result = {
                 "title": r["title"],
-                "year": int(release[:4]) if release and len(release) >= 4 else year,
+                "year": _release_year(r.get("release_date", ""), query_year or year),
                 "tmdb_id": r["id"],
             }
-            # Persist / refresh in PocketBase (keyed on tmdb_id + type)
-            pb.upsert_tmdb(
-                tmdb_id=r["id"],
-                media_type="film",
-                title=r["title"],
-                year=result["year"],
-            )
+            tmdb_cache.put("film", r["id"], result["title"], result["year"])
             if _cache is not None:
                 _cache[title.lower()] = result
             log.info(f"  TMDb API → {title} = {result['title']} ({result['year']}) [tmdbid={result['tmdb_id']}]")
             return result
-    except Exception as e:
-        log.debug(f"TMDb film search failed for '{title}': {e}")
+    _tmdb_misses[("film", title.lower())] = time.time()
     return None
 
 
@@ -452,45 +1340,97 @@ def tmdb_search_tv(title: str, year: int | None = None,
     """Search TMDb for a TV show, return {title, year, tmdb_id} or None.
 
     The in-memory _cache dict deduplicates lookups within a single scan cycle
-    (e.g. 20 episodes of the same show share one cached result).
+    (e.g. 20 episodes of the same show share one cached result). Known
+    titles and the offline export index are consulted before the API.
     """
     if _cache is not None and title.lower() in _cache:
         return _cache[title.lower()]
 
+    local = _local_lookup("show", title, year, _cache) or _offline_lookup("show", title, year, _cache)
+    if local:
+        return local
+
     if not TMDB_API_KEY:
         return None
+    if time.time() - _tmdb_misses.get(("show", title.lower()), 0) < TMDB_MISS_TTL:
+        return None
 
-    params = {"api_key": TMDB_API_KEY, "query": title}
-    if year:
-        params["first_air_date_year"] = year
-    try:
-        resp = requests.get(f"{TMDB_BASE}/search/tv", params=params, timeout=10)
-        resp.raise_for_status()
-        results = resp.json().get("results", [])
-        if results:
-            r = results[0]
-            air_date = r.get("first_air_date", "")
+    for query, query_year in _search_variants(title, year):
+        params = {"api_key": TMDB_API_KEY, "query": query}
+        if query_year:
+            params["first_air_date_year"] = query_year
+        try:
+            resp = tmdb_session.get(f"{TMDB_BASE}/search/tv", params=params, timeout=10)
+            resp.raise_for_status()
+            results = resp.json().get("results", [])
+        except Exception as e:
+            log.debug(f"TMDb TV search failed for '{query}': {e}")
+            return None
+        r = _best_result(results, query, query_year, "name", "first_air_date")
+        if r:
             result = {
                 "title": r["name"],
-                "year": int(air_date[:4]) if air_date and len(air_date) >= 4 else year,
+                "year": _release_year(r.get("first_air_date", ""), query_year or year),
                 "tmdb_id": r["id"],
             }
-            # Persist / refresh in PocketBase (keyed on tmdb_id + type)
-            pb.upsert_tmdb(
-                tmdb_id=r["id"],
-                media_type="show",
-                title=r["name"],
-                year=result["year"],
-            )
+            tmdb_cache.put("show", r["id"], result["title"], result["year"])
             if _cache is not None:
                 _cache[title.lower()] = result
             log.info(f"  TMDb API → {title} = {result['title']} ({result['year']}) [tmdbid={result['tmdb_id']}]")
             return result
-    except Exception as e:
-        log.debug(f"TMDb TV search failed for '{title}': {e}")
+    _tmdb_misses[("show", title.lower())] = time.time()
     return None
 
 
+def refresh_stale_tmdb(limit: int) -> int:
+    """Revalidate up to `limit` stale TMDb cache records with conditional requests.
+
+    Records carrying an ETag are fetched with If-None-Match, so an unchanged
+    record costs a 304 and no body. The PocketBase tmdb row is only rewritten
+    when the canonical title or year actually changed. Returns the number of
+    records that changed.
+    """
+    if not TMDB_API_KEY or limit <= 0:
+        return 0
+
+    changed = 0
+    for media_type, tmdb_id, rec in tmdb_cache.stale(limit):
+        endpoint = "movie" if media_type == "film" else "tv"
+        headers = {"If-None-Match": rec["etag"]} if rec.get("etag") else {}
+        try:
+            resp = tmdb_session.get(
+                f"{TMDB_BASE}/{endpoint}/{tmdb_id}",
+                params={"api_key": TMDB_API_KEY},
+                headers=headers,
+                timeout=10,
+            )
+            if resp.status_code == 304:
+                rec["fetched_at"] = time.time()
+                continue
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception as e:
+            log.debug(f"TMDb refresh failed for {media_type} {tmdb_id}: {e}")
+            continue
+
+        if media_type == "film":
+            title, date = data.get("title"), data.get("release_date", "")
+        else:
+            title, date = data.get("name"), data.get("first_air_date", "")
+        title = title or rec.get("title", "")
+        year = _release_year(date, rec.get("year"))
+
+        if (title, year) != (rec.get("title"), rec.get("year")):
+            log.info(f"  TMDb refresh → {rec.get('title')} ({rec.get('year')}) "
+                     f"is now {title} ({year}) [tmdbid={tmdb_id}]")
+            changed += 1
+        tmdb_cache.put(media_type, tmdb_id, title, year, etag=resp.headers.get("ETag"))
+        if rec.get("pb_id"):
+            tmdb_cache.pocketbase_id(media_type, tmdb_id, title, year)
+
+    return changed
+
+
 # ---------------------------------------------------------------------------
 # Name sanitisation
 # ---------------------------------------------------------------------------
@@ -538,114 +1478,685 @@ def format_episode(title: str, year: int | None, season: int, episode: int | lis
 
 
 # ---------------------------------------------------------------------------
-# File discovery
+# Compact records (one per source file, so kept as plain tuples)
 # ---------------------------------------------------------------------------
 
-def find_video_files(directory: Path) -> list[Path]:
-    """Recursively find all video files in a directory."""
-    if not directory.exists():
-        return []
-    files = []
-    try:
-        for item in directory.rglob("*"):
-            if item.is_file() and item.suffix.lower() in VIDEO_EXTENSIONS:
-                files.append(item)
-    except OSError as e:
-        log.warning(f"Error scanning {directory}: {e}")
-    return files
+class ParsedFilm(NamedTuple):
+    video_path: Path
+    guess_name: str
+    title: str
+    year: int | None
+    tmdb_id: int | None
+    score: int
+    fingerprint: str
+
+
+class FilmCandidate(NamedTuple):
+    video_path: Path
+    score: int
+    guess_name: str
+    title: str
+    year: int | None
+    tmdb_id: int | None
+    fingerprint: str
+
+
+class FilmEntry(NamedTuple):
+    """Tracked film source, as kept in state and mirrored to PocketBase."""
+    title: str
+    year: int | None
+    tmdb_id: int | None
+    target: str
+    score: int | None = 0
+    fingerprint: str = ""
+
+
+class ParsedShow(NamedTuple):
+    video_path: Path
+    title: str
+    year: int | None
+    season: int
+    episode: int | list
+    tmdb_id: int | None
+    score: int
+    fingerprint: str
+
+
+class ShowCandidate(NamedTuple):
+    video_path: Path
+    score: int
+    title: str
+    year: int | None
+    season: int
+    episode: int | list
+    tmdb_id: int | None
+    fingerprint: str
+
+
+class ShowEntry(NamedTuple):
+    """Tracked episode source, as kept in state and mirrored to PocketBase."""
+    title: str
+    year: int | None
+    tmdb_id: int | None
+    season: int
+    episode: int | list
+    target: str
+    score: int | None = 0
+    fingerprint: str = ""
+
+
+def entry_from_dict(cls, data: dict):
+    """Build a FilmEntry/ShowEntry from its dict form (old state files, write queue)."""
+    return cls(*(data.get(f, cls._field_defaults.get(f)) for f in cls._fields))
 
 
 # ---------------------------------------------------------------------------
-# Symlink management
+# File discovery
 # ---------------------------------------------------------------------------
 
-def create_symlink(source: Path, target: Path):
-    """Create a symlink at target pointing to source, creating parent dirs."""
-    try:
-        relative_to_zurg = source.relative_to(ZURG_MOUNT)
-        symlink_target = JELLYFIN_ZURG_PATH / relative_to_zurg
-    except ValueError:
-        symlink_target = source
-
-    if target.exists() or target.is_symlink():
-        if target.is_symlink() and os.readlink(target) == str(symlink_target):
-            return
-        target.unlink()
+def fingerprint(stat: os.stat_result) -> str:
+    """Change-detection key for a source file: "<size>:<mtime>".
 
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.symlink_to(symlink_target)
-    log.info(f"  ✓ {target.relative_to(MEDIA_DIR)} → {symlink_target}")
+    Zurg keeps a path when it repairs a torrent or the torrent is re-added,
+    but the file behind it gets a new size and/or mtime.
+    """
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
 
 
-def cleanup_broken_symlinks(directory: Path):
-    """Remove symlinks whose target no longer exists, then prune empty dirs."""
-    if not directory.exists():
-        return
+class ListingSnapshot:
+    """Persistent listing of every torrent directory on the mount.
 
-    removed = 0
-    for item in directory.rglob("*"):
-        if item.is_symlink() and not item.resolve().exists():
-            log.info(f"  ✗ Removing broken symlink: {item.relative_to(MEDIA_DIR)}")
-            item.unlink()
-            removed += 1
+    A torrent directory whose mtime is unchanged is taken from the snapshot
+    instead of being walked again, so a scan lists the top level of the
+    mount plus only the directories that changed. Each directory is still
+    re-listed at least every `max_age` seconds in case Zurg changed a file
+    without touching the directory.
+    """
 
-    if removed:
-        log.info(f"  Cleaned up {removed} broken symlink(s)")
+    def __init__(self, path: Path, max_age: int):
+        self.path = path
+        self.max_age = max_age
+        self._dirs: dict[str, dict] | None = None
+
+    @property
+    def dirs(self) -> dict[str, dict]:
+        if self._dirs is None:
+            self._dirs = {}
+            if self.path.exists():
+                try:
+                    self._dirs = json.loads(self.path.read_text())
+                except (json.JSONDecodeError, OSError):
+                    log.warning("Corrupt listing snapshot, starting fresh")
+        return self._dirs
+
+    def save(self):
+        """Persist the snapshot to disk (no-op if it was never loaded)."""
+        if self._dirs is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._dirs, separators=(",", ":")))
+
+    def get(self, directory: str, mtime: int) -> dict[str, str] | None:
+        """Files (path → fingerprint) of an unchanged directory; None if it must be listed."""
+        rec = self.dirs.get(directory)
+        if rec and rec["mtime"] == mtime and time.time() - rec["listed_at"] < self.max_age:
+            return rec["files"]
+        return None
 
-    # Prune empty directories (bottom-up)
-    for dirpath in sorted(directory.rglob("*"), reverse=True):
-        if dirpath.is_dir() and not any(dirpath.iterdir()):
-            dirpath.rmdir()
-            log.debug(f"  Removed empty dir: {dirpath}")
+    def put(self, directory: str, mtime: int, files: dict[str, str]):
+        self.dirs[directory] = {"mtime": mtime, "listed_at": time.time(), "files": files}
 
+    def prune(self, parent: str, present: set[str]):
+        """Forget directories under parent that are no longer on the mount."""
+        prefix = f"{parent}/"
+        for directory in [d for d in self.dirs if d.startswith(prefix) and d not in present]:
+            del self.dirs[directory]
 
-# ---------------------------------------------------------------------------
-# Processing logic
-# ---------------------------------------------------------------------------
 
-def process_films(state: dict) -> dict:
-    """Process the Zurg films directory and create film symlinks.
+# Global listing snapshot
+listing_snapshot = ListingSnapshot(LISTING_SNAPSHOT_FILE, LISTING_SNAPSHOT_MAX_AGE)
 
-    TMDB lookups are cached in PocketBase. Each unique film title is only
-    looked up once, ever (across reboots).
-    """
-    processed = state.get("films", {})
-    video_files = find_video_files(ZURG_FILMS)
 
-    if not video_files:
-        log.info("  No video files found in films directory")
-        return processed
+def _list_dir(directory: str) -> list[os.DirEntry]:
+    with os.scandir(directory) as entries:
+        return list(entries)
 
-    # In-memory cache for this scan cycle (avoids repeated PocketBase queries)
-    tmdb_cache: dict[str, dict] = {}
 
-    # Collect candidates grouped by target path
-    candidates: dict[str, list] = {}
+def _walk_video_files(directory: str, found: dict[str, str]):
+    """Add every video file under directory to found, in rglob order.
 
-    for video_path in video_files:
-        relative = video_path.relative_to(ZURG_FILMS)
-        if len(relative.parts) > 1:
-            guess_name = relative.parts[0]
+    Each listing and each file's stat is one operation under the mount
+    limiter, so a walk is paced (and measured) like any other mount I/O.
+    """
+    subdirs = []
+    for item in mount_limiter.call(_list_dir, directory):
+        if item.is_dir():
+            subdirs.append(item.path)
+        elif os.path.splitext(item.name)[1].lower() in VIDEO_EXTENSIONS and item.is_file():
+            found[item.path] = fingerprint(mount_limiter.call(item.stat))
+    for subdir in subdirs:
+        _walk_video_files(subdir, found)
+
+
+def find_video_files(directory: Path) -> dict[Path, str]:
+    """Recursively find all video files in a directory, with their fingerprints.
+
+    Walks with scandir so each file costs a single stat on the mount, in the
+    same order as rglob (a directory's entries, then its subdirectories).
+    With LISTING_SNAPSHOT, unchanged torrent directories are not walked.
+    During a replay the listing comes from the recording instead.
+    """
+    if listing_replay:
+        return listing_replay.files(directory)
+    if not directory.exists():
+        return {}
+    started = time.monotonic()
+    found: dict[str, str] = {}
+    listed = reused = 0
+    try:
+        if not LISTING_SNAPSHOT:
+            _walk_video_files(str(directory), found)
         else:
-            guess_name = video_path.stem
+            subdirs = []
+            for item in mount_limiter.call(_list_dir, directory):
+                if item.is_dir():
+                    subdirs.append((item.path, int(mount_limiter.call(item.stat).st_mtime)))
+                elif os.path.splitext(item.name)[1].lower() in VIDEO_EXTENSIONS and item.is_file():
+                    found[item.path] = fingerprint(mount_limiter.call(item.stat))
+            for path, mtime in subdirs:
+                files = listing_snapshot.get(path, mtime)
+                if files is None:
+                    files = {}
+                    _walk_video_files(path, files)
+                    listing_snapshot.put(path, mtime, files)
+                    listed += 1
+                else:
+                    reused += 1
+                found.update(files)
+            listing_snapshot.prune(str(directory), {path for path, _ in subdirs})
+    except OSError as e:
+        log.warning(f"Error scanning {directory}: {e}")
+    mount_health.record_discovery(directory.name, time.monotonic() - started,
+                                  len(found), listed, reused)
+    files = {Path(path): fp for path, fp in found.items()}
+    if listing_recorder:
+        listing_recorder.add(directory, files)
+    return files
+
+
+# ---------------------------------------------------------------------------
+# Mount health (listing and first-byte latency through the Zurg mount)
+# ---------------------------------------------------------------------------
+
+class MountHealth:
+    """Latency metrics for the Zurg mount, written to MOUNT_HEALTH_FILE.
+
+    Every scan starts with a probe that times a listing of the mount root
+    and of films/shows, and a first-byte read of one random tracked file.
+    Discovery adds how long each directory took to walk and how many
+    torrent directories came from the listing snapshot. The file always
+    holds the latest sample, so it can be scraped or watched without
+    talking to the organiser.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.metrics: dict = {"discovery": {}}
+
+    def record_discovery(self, name: str, seconds: float, files: int,
+                         listed: int, reused: int):
+        self.metrics["discovery"][name] = {
+            "ms": round(seconds * 1000),
+            "files": files,
+            "dirs_listed": listed,
+            "dirs_from_snapshot": reused,
+        }
+
+    def probe(self, sources: list[str]) -> bool:
+        """Probe the mount; False if its root cannot be listed (or is empty)."""
+        if listing_replay:
+            return True
+        listing = {}
+        root_entries = None
+        for name, directory in (("root", ZURG_MOUNT), ("films", ZURG_FILMS), ("shows", ZURG_SHOWS)):
+            ms, count = self._timed(lambda d=directory: len(os.listdir(d)))
+            listing[name] = ms
+            if name == "root":
+                root_entries = count
+        sample = random.choice(sources) if sources else None
+        first_byte = self._timed(partial(self._read_first_byte, sample))[0] if sample else None
+        healthy = bool(root_entries)
+        self.metrics.update(checked_at=round(time.time()), healthy=healthy,
+                            listing_ms=listing, first_byte_ms=first_byte, sample=sample)
+        self.save()
+
+        timings = {f"list {k}": v for k, v in listing.items()}
+        if sample:
+            timings["first byte"] = first_byte
+        log.info("Mount: " + ", ".join(f"{k} {'failed' if v is None else f'{v} ms'}"
+                                       for k, v in timings.items()))
+        return healthy
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.metrics, indent=2))
+
+    @staticmethod
+    def _read_first_byte(path: str):
+        with open(path, "rb") as f:
+            f.read(1)
+
+    @staticmethod
+    def _timed(fn) -> tuple[int | None, object]:
+        """Run fn off-thread; (milliseconds, result), or (None, None) if it failed or hung.
+
+        A hung FUSE call cannot be interrupted, so it is left behind in a
+        daemon thread rather than blocking the scan.
+        """
+        result = {}
+
+        def run():
+            start = time.monotonic()
+            try:
+                result["value"] = fn()
+            except OSError as e:
+                log.debug(f"Mount probe failed: {e}")
+                return
+            result["ms"] = round((time.monotonic() - start) * 1000)
+
+        thread = threading.Thread(target=run, name="mount-probe", daemon=True)
+        thread.start()
+        thread.join(MOUNT_PROBE_TIMEOUT)
+        return result.get("ms"), result.get("value")
+
+
+# Global mount health metrics
+mount_health = MountHealth(MOUNT_HEALTH_FILE)
+
+
+# ---------------------------------------------------------------------------
+# Adaptive mount concurrency (AIMD, so scans never crowd out playback)
+# ---------------------------------------------------------------------------
+
+def jellyfin_playing() -> bool:
+    """Whether any Jellyfin session is playing (not paused) right now."""
+    try:
+        resp = requests.get(f"{JELLYFIN_URL}/Sessions", params={"activeWithinSeconds": 60},
+                            headers={"X-Emby-Token": JELLYFIN_API_KEY}, timeout=2)
+        resp.raise_for_status()
+        return any(s.get("NowPlayingItem") and not s.get("PlayState", {}).get("IsPaused")
+                   for s in resp.json())
+    except Exception as e:
+        log.debug(f"Jellyfin session check failed: {e}")
+    return False
+
+
+class MountLimiter:
+    """Additive-increase / multiplicative-decrease pacing of mount I/O.
+
+    Every fast operation raises the concurrency limit by 1/limit (about one
+    more slot per round of operations), up to `max_limit`. A slow or failed
+    one halves it, at most once per `slow` seconds so a burst of slow
+    results counts once, and doubles the pause taken before each operation
+    (up to MOUNT_PAUSE_MAX); fast operations shrink the pause again. The
+    pause is what slows a sequential walk, which never has more than one
+    operation in flight.
+
+    While Jellyfin is playing something (or the playback signal file
+    exists) the limit is capped at PLAYBACK_CONCURRENCY and every operation
+    waits PLAYBACK_PAUSE more, since Jellyfin streams through the same Zurg.
+    """
+
+    def __init__(self, max_limit: int, slow: float):
+        self.max_limit = max(1, max_limit)
+        self.slow = slow
+        self.limit = 1.0
+        self.pause = 0.0
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._decreased_at = 0.0
+        self._playback = False
+        self._playback_checked = 0.0
+        self.stats: Counter = Counter()
+
+    def playback_active(self) -> bool:
+        """Re-check the playback signals every PLAYBACK_CHECK_INTERVAL."""
+        if not (PLAYBACK_ACTIVE_FILE or JELLYFIN_API_KEY):
+            return False
+        now = time.monotonic()
+        if now - self._playback_checked >= PLAYBACK_CHECK_INTERVAL:
+            # Claimed before checking, so concurrent callers do not all ask
+            self._playback_checked = now
+            self._playback = bool(PLAYBACK_ACTIVE_FILE and os.path.exists(PLAYBACK_ACTIVE_FILE)
+                                  or JELLYFIN_API_KEY and jellyfin_playing())
+        return self._playback
+
+    def allowed(self) -> int:
+        cap = PLAYBACK_CONCURRENCY if self._playback else self.max_limit
+        return max(1, min(int(self.limit), cap))
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn, one mount operation, after the current pause and once a slot is free.
+
+        Its latency (or failure) is fed back into the limit and the pause.
+        """
+        pause = self.pause + (PLAYBACK_PAUSE if self.playback_active() else 0)
+        if pause:
+            time.sleep(pause)
+        with self._cond:
+            # Re-check now and then: the playback signal can change with no release
+            while self.in_flight >= self.allowed():
+                self._cond.wait(PLAYBACK_CHECK_INTERVAL)
+            self.in_flight += 1
+            self.stats["peak"] = max(self.stats["peak"], self.in_flight)
+        started = time.monotonic()
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            self._done(time.monotonic() - started, ok)
+
+    def _done(self, seconds: float, ok: bool):
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if not ok or seconds > self.slow:
+                self.stats["slow" if ok else "failed"] += 1
+                if now - self._decreased_at >= self.slow:
+                    self._decreased_at = now
+                    self.limit = max(1.0, self.limit / 2)
+                    self.pause = min(MOUNT_PAUSE_MAX, max(MOUNT_PAUSE_MIN, self.pause * 2))
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                # Back to full speed after a run of fast operations
+                self.pause = self.pause * 0.9 if self.pause > MOUNT_PAUSE_MIN / 10 else 0.0
+            self._cond.notify_all()
+
+    def report(self) -> dict:
+        """Concurrency figures since the last report (for MOUNT_HEALTH_FILE)."""
+        with self._cond:
+            report = {"limit": int(self.limit), "pause_ms": round(self.pause * 1000),
+                      "peak_in_flight": self.stats["peak"],
+                      "slow": self.stats["slow"], "failed": self.stats["failed"],
+                      "playback_active": self._playback}
+            self.stats.clear()
+        return report
+
+
+# Global mount I/O limiter (every listing, stat and existence check on the mount)
+mount_limiter = MountLimiter(ASYNC_FS_WORKERS, MOUNT_SLOW)
+
+
+def report_mount_pacing():
+    """Log and save how the mount limiter behaved during this scan."""
+    concurrency = mount_health.metrics["concurrency"] = mount_limiter.report()
+    log.info(f"Mount concurrency: limit {concurrency['limit']}, "
+             f"pause {concurrency['pause_ms']} ms, "
+             f"peak {concurrency['peak_in_flight']} in flight, "
+             f"{concurrency['slow']} slow, {concurrency['failed']} failed"
+             + (" (playback active)" if concurrency["playback_active"] else ""))
+    mount_health.save()
+
+
+# ---------------------------------------------------------------------------
+# Listing record / replay — reproduce a library's scan workload offline
+# ---------------------------------------------------------------------------
+
+# A recording is gzipped JSON lines: a header object, then one list per file
+#   [root, path relative to the root, size, mtime]    root is "films"/"shows"
+# and, with LISTING_RECORD_TMDB, one per known TMDb record
+#   ["tmdb", media_type, tmdb_id, title, year]
+RECORDING_VERSION = 1
+
+# Words anonymisation keeps, so anonymised names parse like the originals
+RELEASE_WORDS = {
+    "web", "webrip", "webdl", "dl", "bluray", "blu", "ray", "bdrip", "brrip",
+    "dvdrip", "hdrip", "hdtv", "pdtv", "sdtv", "dvd", "uhd", "hd", "sd", "cam",
+    "hevc", "avc", "xvid", "divx", "av", "vp", "remux", "hdr", "dv", "dovi",
+    "sdr", "hlg", "imax", "aac", "ac", "ddp", "dd", "dts", "ma", "truehd",
+    "atmos", "flac", "opus", "proper", "repack", "internal", "extended",
+    "unrated", "uncut", "remastered", "limited", "complete", "season",
+    "episode", "part", "multi", "dual", "audio", "subs", "nf", "amzn", "dsnp",
+    "hmax", "atvp", "hulu", *(ext.lstrip(".") for ext in VIDEO_EXTENSIONS),
+}
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+class Anonymiser:
+    """Replace title words with pseudo-words, consistently within a recording.
+
+    Each word maps to a same-length pseudo-word derived from a per-recording
+    random salt (never written out), ignoring case, so "Dark" in a file name
+    and in its TMDb title still match. Release tags, numbers, punctuation and
+    one-letter words (the S/E of S01E02) are kept.
+    """
+
+    def __init__(self):
+        self._salt = os.urandom(16)
+        self._words: dict[str, str] = {}
+
+    def _pseudo(self, word: str) -> str:
+        lower = word.lower()
+        if len(word) < 2 or lower in RELEASE_WORDS:
+            return word
+        fake = self._words.get(lower)
+        if fake is None:
+            digest = hashlib.blake2b(lower.encode(), key=self._salt).digest()
+            fake = self._words[lower] = "".join(
+                "abcdefghijklmnopqrstuvwxyz"[b % 26] for b in digest[:len(word)]).ljust(len(word), "x")
+        if word.isupper():
+            return fake.upper()
+        return fake.capitalize() if word[0].isupper() else fake
+
+    def __call__(self, text: str) -> str:
+        return _WORD.sub(lambda m: self._pseudo(m.group()), text)
+
+
+class ListingRecorder:
+    """Collects the listing discovered by a scan and writes it as a recording."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.listings: dict[str, dict[Path, str]] = {}
+
+    def add(self, directory: Path, files: dict[Path, str]):
+        self.listings[directory.name] = files
+
+    def save(self):
+        anonymise = Anonymiser() if LISTING_RECORD_ANONYMISE else str
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with gzip.open(tmp, "wt") as f:
+            f.write(json.dumps({"version": RECORDING_VERSION, "recorded_at": round(time.time()),
+                                "anonymised": LISTING_RECORD_ANONYMISE}) + "\n")
+            for root, files in self.listings.items():
+                base = ZURG_MOUNT / root
+                for video_path, fp in files.items():
+                    size, mtime = fp.split(":")
+                    f.write(json.dumps([root, anonymise(str(video_path.relative_to(base))),
+                                        int(size), int(mtime)]) + "\n")
+            if LISTING_RECORD_TMDB:
+                for key, rec in tmdb_cache.records.items():
+                    media_type, tmdb_id = key.split(":", 1)
+                    f.write(json.dumps(["tmdb", media_type, int(tmdb_id),
+                                        anonymise(rec.get("title", "")), rec.get("year")]) + "\n")
+        tmp.replace(self.path)
+        log.info(f"Recorded {sum(map(len, self.listings.values()))} file(s) to {self.path}"
+                 + (" (anonymised)" if LISTING_RECORD_ANONYMISE else ""))
+        self.listings = {}
+
+
+class ListingReplay:
+    """A recording played back in place of the Zurg mount.
+
+    Discovery, source existence checks and broken-symlink cleanup read the
+    recording; the recorded TMDb records seed the local TMDb cache, so
+    titles resolve exactly as on a warm organiser, with no network calls.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.listings: dict[str, dict[Path, str]] = {}
+        self.sources: set[str] = set()
+
+    def load(self) -> dict:
+        with gzip.open(self.path, "rt") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != RECORDING_VERSION:
+                raise ValueError(f"{self.path}: unsupported recording version {header.get('version')}")
+            for line in f:
+                row = json.loads(line)
+                if row[0] == "tmdb":
+                    _, media_type, tmdb_id, title, year = row
+                    tmdb_cache.put(media_type, tmdb_id, title, year)
+                    continue
+                root, relative, size, mtime = row
+                video_path = ZURG_MOUNT / root / relative
+                self.listings.setdefault(root, {})[video_path] = f"{size}:{mtime}"
+                self.sources.add(str(video_path))
+        return header
+
+    def files(self, directory: Path) -> dict[Path, str]:
+        return dict(self.listings.get(directory.name, {}))
+
+    def exists(self, path: str | Path) -> bool:
+        path = Path(path)
+        if path.is_relative_to(JELLYFIN_ZURG_PATH):
+            path = ZURG_MOUNT / path.relative_to(JELLYFIN_ZURG_PATH)
+        return str(path) in self.sources
+
+
+# Global recorder / replay (each only when configured)
+listing_recorder = ListingRecorder(Path(LISTING_RECORD_FILE)) if LISTING_RECORD_FILE else None
+listing_replay = ListingReplay(Path(LISTING_REPLAY_FILE)) if LISTING_REPLAY_FILE else None
+
+
+def source_exists(path: str | Path) -> bool:
+    """Whether a source file exists (in the replayed recording, during a replay)."""
+    if listing_replay:
+        return listing_replay.exists(path)
+    return mount_limiter.call(os.path.exists, path)
+
+
+# ---------------------------------------------------------------------------
+# Symlink management
+# ---------------------------------------------------------------------------
+
+def shown(target: Path) -> str:
+    """A symlink path for logging: relative to MEDIA_DIR when it is inside it."""
+    return str(target.relative_to(MEDIA_DIR)) if target.is_relative_to(MEDIA_DIR) else str(target)
+
+
+def create_symlink(source: Path, target: Path):
+    """Create a symlink at target pointing to source, creating parent dirs."""
+    try:
+        relative_to_zurg = source.relative_to(ZURG_MOUNT)
+        symlink_target = JELLYFIN_ZURG_PATH / relative_to_zurg
+    except ValueError:
+        symlink_target = source
+
+    # Check the link itself first: target.exists() follows it onto the mount
+    if target.is_symlink() and os.readlink(target) == str(symlink_target):
+        return
+    if target.exists() or target.is_symlink():
+        target.unlink()
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.symlink_to(symlink_target)
+    log.info(f"  ✓ {shown(target)} → {symlink_target}")
+
+
+def remove_moved_symlink(previous: FilmEntry | ShowEntry | None, target_str: str):
+    """Remove a source's old symlink when its target path has changed.
+
+    Happens when a title is renamed on TMDb: the new symlink is created under
+    the new name and the old one would otherwise linger as a duplicate.
+    """
+    if not previous or not previous.target or previous.target == target_str:
+        return
+    old = Path(previous.target)
+    if old.is_symlink():
+        old.unlink()
+        log.info(f"  ✗ Removed renamed symlink: {shown(old)}")
+
+
+def cleanup_broken_symlinks(directory: Path):
+    """Remove symlinks whose target no longer exists, then prune empty dirs."""
+    if not directory.exists():
+        return
+
+    removed = 0
+    for item in directory.rglob("*"):
+        if item.is_symlink() and not source_exists(item.resolve()):
+            log.info(f"  ✗ Removing broken symlink: {shown(item)}")
+            item.unlink()
+            removed += 1
 
+    if removed:
+        log.info(f"  Cleaned up {removed} broken symlink(s)")
+
+    # Prune empty directories (bottom-up)
+    for dirpath in sorted(directory.rglob("*"), reverse=True):
+        if dirpath.is_dir() and not any(dirpath.iterdir()):
+            dirpath.rmdir()
+            log.debug(f"  Removed empty dir: {dirpath}")
+
+
+# ---------------------------------------------------------------------------
+# Processing logic
+# ---------------------------------------------------------------------------
+
+def parse_film(video_path: Path, fingerprint: str, processed: dict,
+               verify: bool = False) -> ParsedFilm:
+    """Parse a film file into a ParsedFilm.
+
+    A tracked source with an unchanged fingerprint is not parsed again: its
+    stored title/year/tmdb_id and score are reused, with any canonical rename
+    from the TMDb cache applied. `verify` re-parses it anyway (keeping its
+    match). A replaced file is parsed and resolved like a new one; tmdb_id
+    is None if a lookup is needed.
+    """
+    relative = video_path.relative_to(ZURG_FILMS)
+    if len(relative.parts) > 1:
+        guess_name = relative.parts[0]
+    else:
+        guess_name = video_path.stem
+
+    existing = processed.get(str(video_path))
+    if existing and existing.fingerprint == fingerprint and not verify:
+        # Fast path: source is tracked and the file has not changed
+        title, year, tmdb_id = existing.title, existing.year, existing.tmdb_id
+        score = existing.score
+    else:
         guess = guessit(guess_name, {"type": "movie"})
         title = guess.get("title", guess_name)
         year = guess.get("year")
         tmdb_id = None
+        score = score_quality(guess_name)
+        if existing and existing.fingerprint in ("", fingerprint):
+            # Being re-verified, or tracked before fingerprints were
+            # recorded: keep its match
+            title, year, tmdb_id = existing.title, existing.year, existing.tmdb_id
+
+    cached = tmdb_cache.get("film", tmdb_id) if tmdb_id is not None else None
+    if cached:
+        # Pick up canonical renames found by the TMDb refresher
+        title, year = cached["title"], cached["year"]
+
+    return ParsedFilm(video_path, guess_name, title, year, tmdb_id, score, fingerprint)
 
-        # Check if already fully processed with same target
-        source_key = str(video_path)
-        if source_key in processed:
-            existing = processed[source_key]
-            # Fast path: if source is tracked and nothing changed, reuse it
-            title = existing.get("title", title)
-            year = existing.get("year", year)
-            tmdb_id = existing.get("tmdb_id")
 
+def collect_film_candidates(parsed: list[ParsedFilm],
+                            lookup_cache: dict) -> dict[str, list[FilmCandidate]]:
+    """Resolve parsed films against TMDb and group them by target path."""
+    candidates: dict[str, list[FilmCandidate]] = {}
+
+    for video_path, guess_name, title, year, tmdb_id, score, fingerprint in parsed:
         # TMDB lookup (cached via PocketBase + in-memory per scan)
         if tmdb_id is None:
-            tmdb = tmdb_search_film(title, year, _cache=tmdb_cache)
+            tmdb = tmdb_search_film(title, year, _cache=lookup_cache)
             if tmdb:
                 title = tmdb["title"]
                 year = tmdb.get("year", year)
@@ -655,80 +2166,172 @@ def process_films(state: dict) -> dict:
         target_file = FILMS_DIR / film_name / f"{film_name}{video_path.suffix}"
         target_str = str(target_file)
 
-        score = score_quality(guess_name)
-
         if target_str not in candidates:
             candidates[target_str] = []
-        candidates[target_str].append((video_path, score, guess_name, title, year, tmdb_id))
+        candidates[target_str].append(
+            FilmCandidate(video_path, score, guess_name, title, year, tmdb_id, fingerprint))
 
-    # For each target, pick the best candidate
-    new_processed = {}
-    for target_str, options in candidates.items():
-        target_file = Path(target_str)
+    return candidates
 
+
+def select_films(candidates: dict[str, list[FilmCandidate]]):
+    """For each target, pick the best candidate; yield (source, target, entry)."""
+    for target_str, options in candidates.items():
         if len(options) > 1:
-            options.sort(key=lambda x: x[1], reverse=True)
+            options.sort(key=lambda x: x.score, reverse=True)
             best = options[0]
-            log.info(f"  Film: {best[3]} — {len(options)} versions found, picking best:")
+            log.info(f"  Film: {best.title} — {len(options)} versions found, picking best:")
             for src, sc, gn, *_ in options:
-                marker = "→" if src == best[0] else " "
+                marker = "→" if src == best.video_path else " "
                 log.info(f"    {marker} {format_score(sc)}  {gn}")
         else:
             best = options[0]
 
-        video_path, score, guess_name, title, year, tmdb_id = best
-        source_key = str(video_path)
+        video_path, score, guess_name, title, year, tmdb_id, fingerprint = best
 
         if len(options) == 1:
             log.info(f"  Film: {guess_name}  {format_score(score)}")
 
-        # create_symlink is idempotent — no-ops if the symlink already exists and is correct
-        create_symlink(video_path, target_file)
+        entry = FilmEntry(sys.intern(title), year, tmdb_id, target_str, score, fingerprint)
+        yield video_path, Path(target_str), entry
 
-        entry = {
-            "title": title,
-            "year": year,
-            "tmdb_id": tmdb_id,
-            "target": target_str,
-            "score": score,
-        }
-        new_processed[source_key] = entry
 
-        # Always upsert to PocketBase so it stays in sync even after a data wipe
-        if tmdb_id is not None:
-            tmdb_record = pb.upsert_tmdb(tmdb_id, "film", title, year)
-            if tmdb_record:
-                pb.upsert_film(
-                    source_path=source_key,
-                    target_path=target_str,
-                    tmdb_row_id=tmdb_record["id"],
-                    score=score,
-                )
+def record_film(source_key: str, entry: FilmEntry) -> bool:
+    """Upsert a film mapping to PocketBase; False if PocketBase failed.
 
-    return new_processed
+    Called for new or changed sources, and for every source when PocketBase
+    has fewer rows than state (e.g. after a data wipe); the tmdb row itself
+    is only rewritten when its title/year changed.
+    """
+    if entry.tmdb_id is None:
+        return True
+    tmdb_row_id = tmdb_cache.pocketbase_id("film", entry.tmdb_id, entry.title, entry.year)
+    return bool(tmdb_row_id and pb.upsert_film(
+        source_path=source_key,
+        target_path=entry.target,
+        tmdb_row_id=tmdb_row_id,
+        score=entry.score,
+        fingerprint=entry.fingerprint,
+    )) and drop_superseded("films", source_key, entry.target)
+
+
+def drop_superseded(collection: str, source_key: str, target: str) -> bool:
+    """Delete mappings of other sources onto this target; False if PocketBase failed.
+
+    When a better copy takes over a target, the copy it replaced is no longer
+    tracked, so its row would otherwise stay behind. One indexed lookup on
+    target_path per write.
+    """
+    rows = pb.sources_for_target(collection, target)
+    if rows is None:
+        return False
+    for row in rows:
+        if row.get("source_path") != source_key:
+            if not pb.delete_record(collection, row["id"]):
+                return False
+            log.debug(f"  Dropped superseded {collection} mapping: {row['source_path']}")
+    return True
+
+
+def link_source(video_path: Path, target_file: Path,
+                previous: FilmEntry | ShowEntry | None):
+    """Create (or keep) a source's symlink and drop its old one if it moved."""
+    # create_symlink is idempotent — no-ops if the symlink already exists and is correct
+    create_symlink(video_path, target_file)
+    remove_moved_symlink(previous, str(target_file))
+
+
+def pocketbase_behind(collection: str, processed: dict) -> bool:
+    """True if PocketBase holds fewer mappings than state tracks.
+
+    Unchanged sources are normally not written to PocketBase at all; this
+    (one cheap count per scan) is what brings a wiped database back. The
+    tmdb rows may have gone with the mappings, so the row ids the TMDb cache
+    remembers are dropped and each is upserted again on its first write.
+    """
+    count = pb.count(collection)
+    tracked = sum(1 for entry in processed.values() if entry.tmdb_id is not None)
+    if count is None or count >= tracked:
+        return False
+    log.info(f"  PocketBase has {count} of {tracked} tracked {collection}, re-syncing all")
+    tmdb_cache.forget_pocketbase_ids()
+    return True
 
 
-def process_shows(state: dict) -> dict:
-    """Process the Zurg shows directory and create TV show symlinks.
+def seen_candidates(key: str, candidates: dict[str, list], picked) -> dict:
+    """Entries for the copies that lost their target to a better one.
 
-    TMDB lookups are cached in PocketBase. All episodes of the same show
-    share one cached TMDB lookup (both in-memory per scan and in PocketBase
-    across scans).
+    Kept in state beside the tracked sources, so an unchanged duplicate
+    takes the fast path on later scans instead of being parsed and looked
+    up again every time.
     """
-    processed = state.get("shows", {})
-    video_files = find_video_files(ZURG_SHOWS)
+    seen = {}
+    for target_str, options in candidates.items():
+        for c in options:
+            source_key = str(c.video_path)
+            if source_key in picked:
+                continue
+            if key == "films":
+                seen[source_key] = FilmEntry(c.title, c.year, c.tmdb_id, target_str,
+                                             c.score, c.fingerprint)
+            else:
+                seen[source_key] = ShowEntry(c.title, c.year, c.tmdb_id, c.season, c.episode,
+                                             target_str, c.score, c.fingerprint)
+    return seen
+
+
+def process_films(state: dict, budget: "ScanBudget") -> dict:
+    """Process the Zurg films directory and create film symlinks.
+
+    TMDB lookups are cached in PocketBase. Each unique film title is only
+    looked up once, ever (across reboots). New and changed files are parsed
+    newest first within the scan's time budget (see schedule_parse).
+    """
+    processed = state.get("films", {})
+    video_files = find_video_files(ZURG_FILMS)
 
     if not video_files:
-        log.info("  No video files found in shows directory")
+        log.info("  No video files found in films directory")
         return processed
 
-    # In-memory cache for this scan cycle
-    tmdb_cache: dict[str, dict] = {}
+    # In-memory cache for this scan cycle (avoids repeated TMDb queries)
+    lookup_cache: dict[str, dict] = {}
+
+    parsed = schedule_parse("film", video_files, state, budget,
+                            partial(tmdb_search_film, _cache=lookup_cache))
+    candidates = collect_film_candidates(parsed, lookup_cache)
+
+    resync = pocketbase_behind("films", processed)
+    new_processed = {}
+    for video_path, target_file, entry in select_films(candidates):
+        source_key = str(video_path)
+        previous = processed.get(source_key)
+        link_source(video_path, target_file, previous)
+        new_processed[source_key] = entry
+        if resync or entry != previous:
+            pb_write("film", source_key, entry)
+
+    state.setdefault("seen", {})["films"] = seen_candidates("films", candidates, new_processed)
+    link_profiles("films", candidates, state)
+
+    return new_processed
 
-    # Collect candidates grouped by target path
-    candidates: dict[str, list] = {}
 
-    for video_path in video_files:
+def parse_show(video_path: Path, fingerprint: str, processed: dict,
+               verify: bool = False) -> ParsedShow | None:
+    """Parse an episode file into a ParsedShow.
+
+    Returns None if no episode number can be found. Unchanged tracked
+    sources are not parsed again unless verified, like parse_film.
+    """
+    existing = processed.get(str(video_path))
+    if existing and existing.fingerprint == fingerprint and not verify:
+        title, year, tmdb_id = existing.title, existing.year, existing.tmdb_id
+        season, episode = existing.season, existing.episode
+        score = existing.score
+        if score is None:
+            score = score_quality(video_path.name)
+    else:
         relative = video_path.relative_to(ZURG_SHOWS)
         if len(relative.parts) > 1:
             guess_name = relative.parts[0]
@@ -754,21 +2357,29 @@ def process_shows(state: dict) -> dict:
 
         if episode is None:
             log.warning(f"  Skipping (no episode detected): {video_path.name}")
-            continue
+            return None
 
         tmdb_id = None
+        score = score_quality(video_path.name)
+        if existing and existing.fingerprint in ("", fingerprint):
+            title, year, tmdb_id = existing.title, existing.year, existing.tmdb_id
+
+    cached = tmdb_cache.get("show", tmdb_id) if tmdb_id is not None else None
+    if cached:
+        title, year = cached["title"], cached["year"]
+
+    return ParsedShow(video_path, title, year, season, episode, tmdb_id, score, fingerprint)
 
-        # Check if already fully processed
-        source_key = str(video_path)
-        if source_key in processed:
-            existing = processed[source_key]
-            title = existing.get("title", title)
-            year = existing.get("year", year)
-            tmdb_id = existing.get("tmdb_id")
 
+def collect_show_candidates(parsed: list[ParsedShow],
+                            lookup_cache: dict) -> dict[str, list[ShowCandidate]]:
+    """Resolve parsed episodes against TMDb and group them by target path."""
+    candidates: dict[str, list[ShowCandidate]] = {}
+
+    for video_path, title, year, season, episode, tmdb_id, score, fingerprint in parsed:
         # TMDB lookup (cached — one lookup per show title, shared by all episodes)
         if tmdb_id is None:
-            tmdb = tmdb_search_tv(title, year, _cache=tmdb_cache)
+            tmdb = tmdb_search_tv(title, year, _cache=lookup_cache)
             if tmdb:
                 title = tmdb["title"]
                 year = tmdb.get("year", year)
@@ -780,129 +2391,763 @@ def process_shows(state: dict) -> dict:
         target_file = season_dir / f"{episode_name}{video_path.suffix}"
         target_str = str(target_file)
 
-        score = score_quality(video_path.name)
-
         if target_str not in candidates:
             candidates[target_str] = []
-        candidates[target_str].append((video_path, score, title, year, season, episode, tmdb_id))
+        candidates[target_str].append(
+            ShowCandidate(video_path, score, title, year, season, episode, tmdb_id, fingerprint))
 
-    # For each target, pick the best candidate
-    new_processed = {}
-    for target_str, options in candidates.items():
-        target_file = Path(target_str)
+    return candidates
 
+
+def select_shows(candidates: dict[str, list[ShowCandidate]]):
+    """For each target, pick the best candidate; yield (source, target, entry)."""
+    for target_str, options in candidates.items():
         if len(options) > 1:
-            options.sort(key=lambda x: x[1], reverse=True)
+            options.sort(key=lambda x: x.score, reverse=True)
             best = options[0]
-            log.info(f"  Show: {best[2]} S{best[4]:02d} — {len(options)} versions, picking best:")
+            log.info(f"  Show: {best.title} S{best.season:02d} — {len(options)} versions, picking best:")
             for src, sc, *_ in options:
-                marker = "→" if src == best[0] else " "
+                marker = "→" if src == best.video_path else " "
                 log.info(f"    {marker} {format_score(sc)}  {src.name}")
         else:
             best = options[0]
 
-        video_path, score, title, year, season, episode, tmdb_id = best
-        source_key = str(video_path)
+        video_path, score, title, year, season, episode, tmdb_id, fingerprint = best
 
         if len(options) == 1:
             log.info(f"  Show: {video_path.name}  {format_score(score)}")
 
-        # create_symlink is idempotent — no-ops if the symlink already exists and is correct
-        create_symlink(video_path, target_file)
+        entry = ShowEntry(sys.intern(title), year, tmdb_id, season,
+                          episode if isinstance(episode, int) else list(episode),
+                          target_str, score, fingerprint)
+        yield video_path, Path(target_str), entry
+
+
+def record_show(source_key: str, entry: ShowEntry) -> bool:
+    """Upsert an episode mapping to PocketBase (see record_film)."""
+    if entry.tmdb_id is None:
+        return True
+    episode = entry.episode
+    tmdb_row_id = tmdb_cache.pocketbase_id("show", entry.tmdb_id, entry.title, entry.year)
+    return bool(tmdb_row_id and pb.upsert_show(
+        source_path=source_key,
+        target_path=entry.target,
+        tmdb_row_id=tmdb_row_id,
+        season=entry.season,
+        episode=episode if isinstance(episode, int) else episode[0],
+        fingerprint=entry.fingerprint,
+    )) and drop_superseded("shows", source_key, entry.target)
+
+
+def process_shows(state: dict, budget: "ScanBudget") -> dict:
+    """Process the Zurg shows directory and create TV show symlinks.
 
-        ep_value = episode if isinstance(episode, int) else list(episode)
-        ep_for_db = episode if isinstance(episode, int) else episode[0]
+    TMDB lookups are cached in PocketBase. All episodes of the same show
+    share one cached TMDB lookup (both in-memory per scan and in PocketBase
+    across scans). Scheduled like process_films.
+    """
+    processed = state.get("shows", {})
+    video_files = find_video_files(ZURG_SHOWS)
 
-        entry = {
-            "title": title,
-            "year": year,
-            "tmdb_id": tmdb_id,
-            "season": season,
-            "episode": ep_value,
-            "target": target_str,
-            "score": score,
-        }
-        new_processed[source_key] = entry
+    if not video_files:
+        log.info("  No video files found in shows directory")
+        return processed
 
-        # Always upsert to PocketBase so it stays in sync even after a data wipe
-        if tmdb_id is not None:
-            tmdb_record = pb.upsert_tmdb(tmdb_id, "show", title, year)
-            if tmdb_record:
-                pb.upsert_show(
-                    source_path=source_key,
-                    target_path=target_str,
-                    tmdb_row_id=tmdb_record["id"],
-                    season=season,
-                    episode=ep_for_db,
-                )
+    # In-memory cache for this scan cycle
+    lookup_cache: dict[str, dict] = {}
 
+    parsed = schedule_parse("show", video_files, state, budget,
+                            partial(tmdb_search_tv, _cache=lookup_cache))
+    candidates = collect_show_candidates(parsed, lookup_cache)
+
+    resync = pocketbase_behind("shows", processed)
+    new_processed = {}
+    for video_path, target_file, entry in select_shows(candidates):
+        source_key = str(video_path)
+        previous = processed.get(source_key)
+        link_source(video_path, target_file, previous)
+        new_processed[source_key] = entry
+        if resync or entry != previous:
+            pb_write("show", source_key, entry)
+
+    state.setdefault("seen", {})["shows"] = seen_candidates("shows", candidates, new_processed)
+    link_profiles("shows", candidates, state)
     return new_processed
 
 
+# ---------------------------------------------------------------------------
+# Output profiles — extra symlink trees picked from the same candidates
+# ---------------------------------------------------------------------------
+
+class OutputProfile(NamedTuple):
+    name: str
+    root: Path
+    min_score: int | None = None
+    max_score: int | None = None
+    select: str = "best"
+
+    def pick(self, options: list[FilmCandidate] | list[ShowCandidate]):
+        """The candidate this profile links for one target, or None."""
+        eligible = [c for c in options
+                    if (self.min_score is None or c.score >= self.min_score)
+                    and (self.max_score is None or c.score <= self.max_score)]
+        if not eligible:
+            return None
+        if self.select == "smallest":
+            # Ties go to the better copy; entries carried over from an old
+            # state (or seeded from PocketBase) have no size and go last
+            return min(eligible, key=lambda c: (_fingerprint_size(c.fingerprint), -c.score))
+        if self.select == "worst":
+            return min(eligible, key=lambda c: c.score)
+        return max(eligible, key=lambda c: c.score)
+
+
+PROFILE_SELECTIONS = ("best", "worst", "smallest")
+
+
+def _fingerprint_size(fingerprint: str) -> float:
+    """File size recorded in a fingerprint, or infinity when it has none."""
+    size = fingerprint.partition(":")[0]
+    return int(size) if size.isdigit() else float("inf")
+
+
+def parse_output_profiles(raw: str) -> list[OutputProfile]:
+    """Parse OUTPUT_PROFILES; invalid profiles are logged and skipped."""
+    if not raw.strip():
+        return []
+    try:
+        specs = json.loads(raw)
+    except json.JSONDecodeError as e:
+        log.error(f"OUTPUT_PROFILES is not valid JSON, ignoring it: {e}")
+        return []
+    profiles = []
+    for spec in specs if isinstance(specs, list) else [specs]:
+        try:
+            profile = OutputProfile(str(spec["name"]), Path(spec["root"]),
+                                    spec.get("min_score"), spec.get("max_score"),
+                                    spec.get("select", "best"))
+        except (KeyError, TypeError) as e:
+            log.error(f"Output profile {spec!r} is missing {e}, skipping it")
+            continue
+        if profile.select not in PROFILE_SELECTIONS:
+            log.error(f"Output profile {profile.name}: select must be one of "
+                      f"{', '.join(PROFILE_SELECTIONS)}, skipping it")
+        elif any(score is not None and type(score) is not int
+                 for score in (profile.min_score, profile.max_score)):
+            log.error(f"Output profile {profile.name}: min_score and max_score must be "
+                      f"whole numbers, skipping it")
+        elif profile.root in (MEDIA_DIR, FILMS_DIR, SHOWS_DIR):
+            log.error(f"Output profile {profile.name}: root {profile.root} is the main "
+                      f"library, skipping it")
+        elif LISTING_REPLAY_FILE:
+            # A replay builds its profile trees in the scratch directory too
+            profiles.append(profile._replace(root=LISTING_REPLAY_DIR / "profiles" / profile.name))
+        else:
+            profiles.append(profile)
+    return profiles
+
+
+# Global extra output profiles
+output_profiles = parse_output_profiles(OUTPUT_PROFILES)
+
+
+def link_profiles(key: str, candidates: dict[str, list], state: dict):
+    """Link every output profile's picks and drop the links it no longer picks.
+
+    Targets mirror the main library under each profile's root. The targets
+    each profile linked are kept in state, so links left by a rename, a
+    removed source or a changed filter are cleaned up on the next scan.
+    """
+    tracked = state.setdefault("profiles", {})
+    for profile in output_profiles:
+        linked = tracked.setdefault(profile.name, {})
+        previous = set(linked.get(key, ()))
+        current = []
+        for target_str, options in candidates.items():
+            pick = profile.pick(options)
+            if pick is None:
+                continue
+            target = profile.root / Path(target_str).relative_to(MEDIA_DIR)
+            create_symlink(pick.video_path, target)
+            current.append(str(target))
+        for target_str in previous.difference(current):
+            target = Path(target_str)
+            if target.is_symlink():
+                target.unlink()
+                log.info(f"  ✗ {profile.name}: removed {shown(target)}")
+        linked[key] = current
+
+
+# ---------------------------------------------------------------------------
+# Scan scheduling — newest work first, within a per-cycle time budget
+# ---------------------------------------------------------------------------
+
+class ScanBudget:
+    """Wall-clock budget for the parse/resolve work of one scan cycle."""
+
+    def __init__(self, seconds: float):
+        self.deadline = time.monotonic() + seconds if seconds > 0 else None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def share(self, fraction: float) -> "ScanBudget":
+        """A budget ending once `fraction` of the time left has passed."""
+        share = ScanBudget(0)
+        if self.deadline is not None:
+            now = time.monotonic()
+            share.deadline = now + max(0.0, self.deadline - now) * fraction
+        return share
+
+
+# Most of a scan's budget films may use, so a large film import never leaves
+# new episodes waiting (shows get whatever films leave over)
+FILM_BUDGET_SHARE = 0.5
+
+
+# When each source was last re-verified (in memory only; after a restart
+# sources are simply verified once more)
+_verified_at: dict[str, float] = {}
+VERIFY_INTERVAL = 86400  # seconds before a source is due for re-verification
+
+
+class ScanCheckpoint:
+    """Progress of an unfinished scan: parse results of completed torrent directories.
+
+    Saved every CHECKPOINT_INTERVAL seconds while a scan parses (together
+    with the TMDb cache, which holds every lookup resolved so far) and
+    removed once the scan's state is saved. After a crash, the next scan
+    takes each source's parse from here instead of redoing it, as long as
+    the file's fingerprint has not changed since.
+    """
+
+    def __init__(self, path: Path, interval: int):
+        self.path = path
+        self.interval = interval
+        self._data: dict[str, dict[str, list]] | None = None
+        self._saved_at = time.monotonic()
+
+    @property
+    def data(self) -> dict[str, dict[str, list]]:
+        if self._data is None:
+            self._data = {"films": {}, "shows": {}}
+            if self.path.exists():
+                try:
+                    self._data = json.loads(self.path.read_text())
+                except (json.JSONDecodeError, OSError):
+                    log.warning("Corrupt scan checkpoint, ignoring it")
+        return self._data
+
+    def resume(self, key: str, video_path: Path, fingerprint: str) -> list | None:
+        """Checkpointed parse fields (after video_path) for an unchanged source.
+
+        None if there is none; an empty list if the parse found nothing.
+        """
+        row = self.data.get(key, {}).get(str(video_path))
+        if row and row[0] == fingerprint:
+            return row[1:]
+        return None
+
+    def add(self, key: str, video_paths: list[Path], fingerprints: dict[Path, str],
+            parsed: dict[Path, ParsedFilm | ParsedShow | None]):
+        done = self.data.setdefault(key, {})
+        for video_path in video_paths:
+            record = parsed[video_path]
+            done[str(video_path)] = [fingerprints[video_path], *(record[1:] if record else ())]
+
+    def save_due(self, lookups: bool = True):
+        """Save if CHECKPOINT_INTERVAL has passed since the last save."""
+        if time.monotonic() - self._saved_at < self.interval:
+            return
+        self._saved_at = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, separators=(",", ":")))
+        tmp.replace(self.path)
+        if lookups:
+            tmdb_cache.save()
+
+    def clear(self):
+        """Drop the checkpoint once a scan has finished."""
+        self._data = None
+        self._saved_at = time.monotonic()
+        self.path.unlink(missing_ok=True)
+
+
+# Global scan checkpoint
+scan_checkpoint = ScanCheckpoint(SCAN_CHECKPOINT_FILE, CHECKPOINT_INTERVAL)
+
+
+def _torrent_dir(root: Path, video_path: Path) -> str:
+    return video_path.relative_to(root).parts[0]
+
+
+def _file_mtime(fingerprint: str) -> int:
+    return int(fingerprint.rsplit(":", 1)[1])
+
+
+def plan_work(media_type: str, video_files: dict[Path, str], processed: dict,
+              cursor: str) -> tuple[list[Path], set[Path], list[Path]]:
+    """Order the sources that need a full parse this cycle.
+
+    Returns (work, verify, trickle). Work is, in priority order:
+      1. new or changed sources, newest torrent directory first
+      2. unchanged episodes of recently active shows (a file added within
+         RECENT_ACTIVITY_DAYS)
+      3. a round-robin trickle through every other tracked source, resuming
+         after `cursor`
+    Tiers 2 and 3 are re-verification: VERIFY_PER_SCAN sources in total,
+    each at most once per VERIFY_INTERVAL. Trickle is tier 3 alone, in
+    cursor order; the cursor only moves past the ones actually parsed.
+    """
+    root = ZURG_FILMS if media_type == "film" else ZURG_SHOWS
+    changed: list[Path] = []
+    unchanged: list[Path] = []
+    torrent_mtime: dict[str, int] = {}
+    for video_path, fp in video_files.items():
+        torrent = _torrent_dir(root, video_path)
+        torrent_mtime[torrent] = max(torrent_mtime.get(torrent, 0), _file_mtime(fp))
+        existing = processed.get(str(video_path))
+        if existing and existing.fingerprint == fp:
+            unchanged.append(video_path)
+        else:
+            changed.append(video_path)
+    # Stable sort: files within a torrent keep their discovery order
+    changed.sort(key=lambda p: torrent_mtime[_torrent_dir(root, p)], reverse=True)
+
+    verify: list[Path] = []
+    now = time.time()
+    unchanged = [p for p in unchanged if now - _verified_at.get(str(p), 0) >= VERIFY_INTERVAL]
+    if media_type == "show":
+        recent = now - RECENT_ACTIVITY_DAYS * 86400
+        active = {processed[str(p)].tmdb_id for p in unchanged
+                  if _file_mtime(video_files[p]) >= recent}
+        active.discard(None)
+        due = [p for p in unchanged if processed[str(p)].tmdb_id in active]
+        due.sort(key=lambda p: _file_mtime(video_files[p]), reverse=True)
+        verify = due[:VERIFY_PER_SCAN]
+
+    chosen = set(verify)
+    rest = sorted(str(p) for p in unchanged if p not in chosen)
+    trickle: list[Path] = []
+    if rest and len(verify) < VERIFY_PER_SCAN:
+        start = next((i for i, key in enumerate(rest) if key > cursor), 0)
+        trickle = [Path(key) for key in (rest[start:] + rest[:start])[:VERIFY_PER_SCAN - len(verify)]]
+
+    return changed + verify + trickle, set(verify + trickle), trickle
+
+
+def schedule_parse(media_type: str, video_files: dict[Path, str], state: dict,
+                   budget: ScanBudget, resolve=None) -> list:
+    """Parse this cycle's sources in priority order within the time budget.
+
+    Unchanged sources always take the cheap path. Work the budget does not
+    reach is carried over: a tracked source keeps its stored entry (and old
+    fingerprint, so it is still pending next cycle) and a new one is left
+    for the next scan. `resolve` (a TMDb search) is run on each parse
+    inside the budget and its result kept in the record; without it titles
+    are resolved afterwards.
+
+    New and changed sources are checkpointed a torrent directory at a time
+    and taken from the checkpoint of an interrupted scan (see ScanCheckpoint).
+
+    Returns the parsed records in discovery order.
+    """
+    key = "films" if media_type == "film" else "shows"
+    root = ZURG_FILMS if media_type == "film" else ZURG_SHOWS
+    parse = parse_film if media_type == "film" else parse_show
+    record_type = ParsedFilm if media_type == "film" else ParsedShow
+    if media_type == "film":
+        budget = budget.share(FILM_BUDGET_SHARE)
+    # Losing duplicates are known too, and skip parsing while unchanged
+    processed = ChainMap(state.get(key, {}), state.get("seen", {}).get(key, {}))
+    cursors = state.setdefault("verify_cursor", {})
+    work, verify, trickle = plan_work(media_type, video_files, processed, cursors.get(key, ""))
+
+    # Changed sources still to parse, per torrent directory
+    torrents: dict[str, list[Path]] = {}
+    for video_path in work:
+        if video_path not in verify:
+            torrents.setdefault(_torrent_dir(root, video_path), []).append(video_path)
+    remaining = {torrent: len(paths) for torrent, paths in torrents.items()}
+
+    full = {}
+    resumed = 0
+    for video_path in work:
+        fingerprint = video_files[video_path]
+        row = None if video_path in verify else scan_checkpoint.resume(key, video_path, fingerprint)
+        if row is not None:
+            full[video_path] = record_type(video_path, *row) if row else None
+            resumed += 1
+        elif budget.exhausted:
+            break
+        else:
+            parsed = full[video_path] = parse(video_path, fingerprint, processed,
+                                              verify=video_path in verify)
+            if video_path in verify:
+                _verified_at[str(video_path)] = time.time()
+            if resolve and parsed and parsed.tmdb_id is None:
+                tmdb = resolve(parsed.title, parsed.year)
+                if tmdb:
+                    # Checkpointed resolved, so a resumed scan skips the lookup
+                    full[video_path] = parsed._replace(
+                        title=tmdb["title"], year=tmdb.get("year", parsed.year),
+                        tmdb_id=tmdb.get("tmdb_id"))
+        if video_path not in verify:
+            torrent = _torrent_dir(root, video_path)
+            remaining[torrent] -= 1
+            if not remaining[torrent]:
+                scan_checkpoint.add(key, torrents[torrent], video_files, full)
+                # Async scans resolve titles later, on other threads
+                scan_checkpoint.save_due(lookups=resolve is not None)
+
+    # Resume the round-robin after the last source it actually re-verified
+    trickled = [p for p in trickle if p in full]
+    if trickled:
+        cursors[key] = str(trickled[-1])
+
+    pending = set(work[len(full):])
+    parsed_all = []
+    carried = 0
+    for video_path, fp in video_files.items():
+        if video_path in full:
+            parsed = full[video_path]
+        elif video_path in pending and video_path not in verify:
+            carried += 1
+            existing = processed.get(str(video_path))
+            if not existing:
+                continue
+            parsed = parse(video_path, existing.fingerprint, processed)
+        else:
+            parsed = parse(video_path, fp, processed)
+        if parsed:
+            parsed_all.append(parsed)
+
+    verified = len(verify & full.keys())
+    log.info(f"  {len(video_files)} file(s): {len(full) - verified - resumed} new/changed parsed, "
+             f"{verified} re-verified"
+             + (f", {resumed} resumed from the last checkpoint" if resumed else "")
+             + (f", {carried} carried over to the next scan (time budget)" if carried else ""))
+    return parsed_all
+
+
 # ---------------------------------------------------------------------------
 # State persistence (kept as fallback alongside PocketBase)
 # ---------------------------------------------------------------------------
 
+# On disk, entries are grouped by source directory (so each torrent directory
+# is stored once), stored as field lists rather than objects, and targets are
+# kept relative to MEDIA_DIR. Version 1 files (one object per full path) are
+# still read.
+STATE_VERSION = 2
+STATE_ENTRY_TYPES = {"films": FilmEntry, "shows": ShowEntry}
+
+
+def _pack_entries(entries: dict) -> dict[str, dict[str, list]]:
+    prefix = f"{MEDIA_DIR}/"
+    packed: dict[str, dict[str, list]] = {}
+    for source, entry in entries.items():
+        directory, _, name = source.rpartition("/")
+        packed.setdefault(directory, {})[name] = list(
+            entry._replace(target=entry.target.removeprefix(prefix)))
+    return packed
+
+
+def _unpack_entries(cls, packed: dict[str, dict[str, list]]) -> dict:
+    prefix = f"{MEDIA_DIR}/"
+    target_at = cls._fields.index("target")
+    entries = {}
+    for directory, files in packed.items():
+        for name, row in files.items():
+            # Titles repeat across every episode of a show: keep one copy
+            row[0] = sys.intern(row[0])
+            if row[target_at] and not row[target_at].startswith("/"):
+                row[target_at] = prefix + row[target_at]
+            entries[f"{directory}/{name}"] = cls(*row)
+    return entries
+
+
 def load_state() -> dict:
     """Load the processing state from disk."""
     if STATE_FILE.exists():
+        # Building one record per source would otherwise trigger repeated
+        # full garbage collections on large libraries
+        gc.disable()
         try:
-            return json.loads(STATE_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
+            data = json.loads(STATE_FILE.read_text())
+            if data.get("version") == STATE_VERSION:
+                state = {key: _unpack_entries(cls, data.get(key, {}))
+                         for key, cls in STATE_ENTRY_TYPES.items()}
+            else:
+                state = {key: {source: entry_from_dict(cls, entry)
+                               for source, entry in data.get(key, {}).items()}
+                         for key, cls in STATE_ENTRY_TYPES.items()}
+            state["seen"] = {key: _unpack_entries(cls, data.get("seen", {}).get(key, {}))
+                             for key, cls in STATE_ENTRY_TYPES.items()}
+            state["verify_cursor"] = data.get("verify_cursor", {})
+            state["profiles"] = data.get("profiles", {})
+            return state
+        except (json.JSONDecodeError, OSError, TypeError, ValueError):
             log.warning("Corrupt state file, starting fresh")
+        finally:
+            gc.enable()
     return {"films": {}, "shows": {}}
 
 
 def save_state(state: dict):
     """Persist the processing state to disk."""
+    data = {"version": STATE_VERSION}
+    for key in STATE_ENTRY_TYPES:
+        data[key] = _pack_entries(state.get(key, {}))
+    data["seen"] = {key: _pack_entries(entries) for key, entries in state.get("seen", {}).items()}
+    data["verify_cursor"] = state.get("verify_cursor", {})
+    data["profiles"] = state.get("profiles", {})
     STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(state, indent=2))
+    STATE_FILE.write_text(json.dumps(data, separators=(",", ":")))
+
+
+# ---------------------------------------------------------------------------
+# Library snapshot — every mapping and TMDb record in one checksummed file,
+# so /media and PocketBase can be restored without PocketBase
+# ---------------------------------------------------------------------------
+
+# Layout: a header (magic, version, creation time, record count), then
+# zlib-compressed blocks of JSON-lines records, each preceded by its
+# compressed length and CRC-32, then a zero-length block. Readers verify
+# and decode one block at a time, so a snapshot is streamed, never loaded
+# whole. Records are lists tagged by kind:
+#   ["t", media_type, tmdb_id, title, year]    TMDb record (written first)
+#   ["f", source, *FilmEntry fields]            film mapping
+#   ["s", source, *ShowEntry fields]            episode mapping
+# with targets relative to MEDIA_DIR, as in the state file.
+SNAPSHOT_MAGIC = b"MOSNAP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct(">6sHdI")
+SNAPSHOT_BLOCK = struct.Struct(">II")
+SNAPSHOT_BLOCK_RECORDS = 1000
+SNAPSHOT_ENTRY_TYPES = {"f": FilmEntry, "s": ShowEntry}
+
+
+class SnapshotCorrupt(Exception):
+    """The library snapshot is truncated, fails its checksum, or is not one."""
+
+
+def _snapshot_records(state: dict):
+    prefix = f"{MEDIA_DIR}/"
+    for key, rec in sorted(tmdb_cache.records.items()):
+        media_type, tmdb_id = key.split(":", 1)
+        yield ["t", media_type, int(tmdb_id), rec.get("title", ""), rec.get("year")]
+    for kind, key in (("f", "films"), ("s", "shows")):
+        for source, entry in sorted(state.get(key, {}).items()):
+            yield [kind, source, *entry._replace(target=entry.target.removeprefix(prefix))]
+
+
+def write_library_snapshot(state: dict) -> int:
+    """Write the snapshot of state and the TMDb cache atomically; returns its record count."""
+    path = LIBRARY_SNAPSHOT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    count = 0
+    with open(tmp, "wb") as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, time.time(), 0))
+        block: list[str] = []
+        for record in _snapshot_records(state):
+            block.append(json.dumps(record, separators=(",", ":")))
+            if len(block) == SNAPSHOT_BLOCK_RECORDS:
+                count += _write_snapshot_block(f, block)
+        count += _write_snapshot_block(f, block)
+        f.write(SNAPSHOT_BLOCK.pack(0, 0))
+        # The count goes in last, so an interrupted write never looks complete
+        f.seek(0)
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, time.time(), count))
+    tmp.replace(path)
+    return count
+
+
+def _write_snapshot_block(f, block: list[str]) -> int:
+    if not block:
+        return 0
+    data = zlib.compress("\n".join(block).encode())
+    f.write(SNAPSHOT_BLOCK.pack(len(data), zlib.crc32(data)))
+    f.write(data)
+    written = len(block)
+    block.clear()
+    return written
+
+
+def iter_library_snapshot():
+    """Yield the snapshot's records in order, verifying each block first.
+
+    Raises SnapshotCorrupt on a bad header or checksum, or if the file ends
+    early; records from the blocks before that have already been yielded.
+    Entry records are yielded as (kind, source, FilmEntry/ShowEntry).
+    """
+    prefix = f"{MEDIA_DIR}/"
+    path = LIBRARY_SNAPSHOT_FILE
+    with open(path, "rb") as f:
+        header = f.read(SNAPSHOT_HEADER.size)
+        if len(header) < SNAPSHOT_HEADER.size:
+            raise SnapshotCorrupt(f"{path}: truncated header")
+        magic, version, _, expected = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise SnapshotCorrupt(f"{path}: not a version {SNAPSHOT_VERSION} library snapshot")
+        seen = 0
+        while True:
+            head = f.read(SNAPSHOT_BLOCK.size)
+            if len(head) < SNAPSHOT_BLOCK.size:
+                raise SnapshotCorrupt(f"{path}: truncated after {seen} record(s)")
+            length, crc = SNAPSHOT_BLOCK.unpack(head)
+            if not length:
+                break
+            data = f.read(length)
+            if len(data) < length or zlib.crc32(data) != crc:
+                raise SnapshotCorrupt(f"{path}: bad block after {seen} record(s)")
+            for line in zlib.decompress(data).split(b"\n"):
+                record = json.loads(line)
+                seen += 1
+                cls = SNAPSHOT_ENTRY_TYPES.get(record[0])
+                if cls is None:
+                    yield tuple(record)
+                    continue
+                entry = cls(*record[2:])
+                if entry.target and not entry.target.startswith("/"):
+                    entry = entry._replace(target=prefix + entry.target)
+                yield record[0], record[1], entry
+        if seen != expected:
+            raise SnapshotCorrupt(f"{path}: {seen} record(s), header says {expected}")
+
+
+def state_from_library_snapshot() -> dict:
+    """Build local state from the library snapshot (empty if there is none)."""
+    state: dict = {"films": {}, "shows": {}}
+    if not LIBRARY_SNAPSHOT_FILE.exists():
+        return state
+    try:
+        for record in iter_library_snapshot():
+            if record[0] == "t":
+                _, media_type, tmdb_id, title, year = record
+                if tmdb_cache.get(media_type, tmdb_id) is None:
+                    tmdb_cache.put(media_type, tmdb_id, title, year, fetched_at=0)
+            else:
+                kind, source, entry = record
+                state["films" if kind == "f" else "shows"][source] = entry._replace(
+                    title=sys.intern(entry.title))
+    except (OSError, SnapshotCorrupt, ValueError, TypeError) as e:
+        log.warning(f"Library snapshot unusable, ignoring it: {e}")
+        return {"films": {}, "shows": {}}
+    return state
+
+
+def run_reseed():
+    """Restore PocketBase's tmdb, films and shows rows from the library snapshot.
+
+    Streams the snapshot, so memory stays flat however large the library.
+    Rows that already match are left alone, so a reseed can be re-run.
+    """
+    log.info("=" * 60)
+    log.info("RESEED MODE — restoring PocketBase from the library snapshot")
+    log.info("=" * 60)
+
+    if not LIBRARY_SNAPSHOT_FILE.exists():
+        log.warning(f"No library snapshot at {LIBRARY_SNAPSHOT_FILE}. Nothing to reseed.")
+        return
+
+    written = Counter()
+    failed = 0
+    try:
+        for record in iter_library_snapshot():
+            if record[0] == "t":
+                _, media_type, tmdb_id, title, year = record
+                rec = tmdb_cache.get(media_type, tmdb_id) or tmdb_cache.put(
+                    media_type, tmdb_id, title, year, fetched_at=0)
+                # The row ids the cache remembers may belong to a lost database
+                rec.pop("pb_id", None)
+                ok = tmdb_cache.pocketbase_id(media_type, tmdb_id, rec["title"], rec["year"])
+            else:
+                kind, source, entry = record
+                ok = (record_film if kind == "f" else record_show)(source, entry)
+            if ok:
+                written[record[0]] += 1
+            else:
+                failed += 1
+    except (OSError, SnapshotCorrupt, ValueError, TypeError) as e:
+        log.error(f"Library snapshot unusable, reseed stopped early: {e}")
+    tmdb_cache.save()
+
+    log.info("=" * 60)
+    log.info(f"Reseed complete: {written['t']} TMDb record(s), {written['f']} film(s), "
+             f"{written['s']} episode(s); {failed} failed")
+    log.info("=" * 60)
 
 
 # ---------------------------------------------------------------------------
 # Rebuild mode — recreate all symlinks from PocketBase without TMDB calls
 # ---------------------------------------------------------------------------
 
+def _snapshot_links():
+    for record in iter_library_snapshot():
+        if record[0] != "t":
+            yield record[1], record[2].target
+
+
 def run_rebuild():
     """Rebuild all symlinks from PocketBase films/shows records.
 
     This mode does NOT query TMDB at all. It reads every record from
-    PocketBase, verifies that the source file still exists on the Zurg
-    mount, and recreates the symlink.
+    PocketBase (or streams the library snapshot, with REBUILD_FROM=snapshot
+    or when PocketBase has nothing), verifies that the source file still
+    exists on the Zurg mount, and recreates the symlink.
     """
+    from_snapshot = REBUILD_FROM == "snapshot"
     log.info("=" * 60)
-    log.info("REBUILD MODE — recreating symlinks from PocketBase")
+    log.info(f"REBUILD MODE — recreating symlinks from "
+             f"{'the library snapshot' if from_snapshot else 'PocketBase'}")
     log.info("=" * 60)
 
-    all_items = pb.list_all_films() + pb.list_all_shows()
-    if not all_items:
+    if not from_snapshot:
+        all_items = [(item["source_path"], item["target_path"])
+                     for item in pb.list_all_films() + pb.list_all_shows()]
+        if all_items:
+            log.info(f"Found {len(all_items)} media item(s) in PocketBase")
+        elif LIBRARY_SNAPSHOT_FILE.exists():
+            log.warning("No media items found in PocketBase — using the library snapshot")
+            from_snapshot = True
+    if from_snapshot:
+        if not LIBRARY_SNAPSHOT_FILE.exists():
+            log.warning(f"No library snapshot at {LIBRARY_SNAPSHOT_FILE}. Nothing to rebuild.")
+            return
+        all_items = _snapshot_links()
+    elif not all_items:
         log.warning("No media items found in PocketBase. Nothing to rebuild.")
         return
 
-    log.info(f"Found {len(all_items)} media item(s) in PocketBase")
-
     rebuilt = 0
     skipped = 0
     missing = 0
 
-    for item in all_items:
-        source = Path(item["source_path"])
-        target = Path(item["target_path"])
-
-        if not source.exists():
-            log.warning(f"  ✗ Source missing: {source}")
-            missing += 1
-            continue
+    try:
+        for source, target in all_items:
+            source = Path(source)
+            target = Path(target)
 
-        if target.exists() or target.is_symlink():
-            if target.is_symlink():
-                # Already linked — skip
-                skipped += 1
+            if not source.exists():
+                log.warning(f"  ✗ Source missing: {source}")
+                missing += 1
                 continue
-            target.unlink()
 
-        create_symlink(source, target)
-        rebuilt += 1
+            if target.exists() or target.is_symlink():
+                if target.is_symlink():
+                    # Already linked — skip
+                    skipped += 1
+                    continue
+                target.unlink()
+
+            create_symlink(source, target)
+            rebuilt += 1
+    except (OSError, SnapshotCorrupt, ValueError, TypeError) as e:
+        # Links from the blocks before a damaged one are already in place
+        log.error(f"Library snapshot unusable, rebuild stopped early: {e}")
 
     log.info("=" * 60)
     log.info(f"Rebuild complete: {rebuilt} created, {skipped} already linked, {missing} source(s) missing")
@@ -924,24 +3169,29 @@ def sync_state_from_pocketbase() -> dict:
 
     for item in pb.list_all_films():
         tmdb_exp = (item.get("expand") or {}).get("tmdb", {})
-        state["films"][item["source_path"]] = {
-            "title": tmdb_exp.get("title", ""),
-            "year": tmdb_exp.get("year"),
-            "tmdb_id": tmdb_exp.get("tmdb_id"),
-            "target": item.get("target_path", ""),
-            "score": item.get("score", 0),
-        }
+        tmdb_cache.seed(tmdb_exp)
+        state["films"][item["source_path"]] = FilmEntry(
+            title=sys.intern(tmdb_exp.get("title", "")),
+            year=tmdb_exp.get("year"),
+            tmdb_id=tmdb_exp.get("tmdb_id"),
+            target=item.get("target_path", ""),
+            score=item.get("score", 0),
+            fingerprint=item.get("fingerprint", ""),
+        )
 
     for item in pb.list_all_shows():
         tmdb_exp = (item.get("expand") or {}).get("tmdb", {})
-        state["shows"][item["source_path"]] = {
-            "title": tmdb_exp.get("title", ""),
-            "year": tmdb_exp.get("year"),
-            "tmdb_id": tmdb_exp.get("tmdb_id"),
-            "season": item.get("season"),
-            "episode": item.get("episode"),
-            "target": item.get("target_path", ""),
-        }
+        tmdb_cache.seed(tmdb_exp)
+        state["shows"][item["source_path"]] = ShowEntry(
+            title=sys.intern(tmdb_exp.get("title", "")),
+            year=tmdb_exp.get("year"),
+            tmdb_id=tmdb_exp.get("tmdb_id"),
+            season=item.get("season"),
+            episode=item.get("episode"),
+            target=item.get("target_path", ""),
+            score=None,  # not stored in PocketBase; recomputed on the next scan
+            fingerprint=item.get("fingerprint", ""),
+        )
 
     return state
 
@@ -950,64 +3200,418 @@ def sync_state_from_pocketbase() -> dict:
 # Main loop
 # ---------------------------------------------------------------------------
 
-def run_scan():
-    """Run a single scan cycle."""
+def forget_source(media_type: str, source_key: str) -> bool:
+    """Delete the PocketBase mapping for a source that no longer exists."""
+    return pb.delete_by_source("films" if media_type == "film" else "shows", source_key)
+
+
+# Queued PocketBase writes by op name → fn(source_key, entry) -> success.
+# Entries are queued in dict form and rebuilt with these types on replay.
+PB_ENTRY_TYPES = {"film": FilmEntry, "show": ShowEntry}
+PB_WRITES = {
+    "film": record_film,
+    "show": record_show,
+    "forget_film": lambda source_key, _: forget_source("film", source_key),
+    "forget_show": lambda source_key, _: forget_source("show", source_key),
+}
+
+
+def pb_write(op: str, source_key: str, entry: FilmEntry | ShowEntry | None = None):
+    """Apply a PocketBase write now, or queue it durably if that fails.
+
+    A write for a source (or onto a target) that still has older writes
+    queued joins the back of the queue, so writes for the same source, and
+    the mappings competing for a target, are always applied in order. A
+    listing replay writes nothing.
+    """
+    if listing_replay:
+        return
+    queued = entry._asdict() if entry else None
+    if pb.breaker.is_open or pb_queue.blocks(source_key, entry.target if entry else None):
+        pb_queue.push(op, source_key, queued)
+    elif not PB_WRITES[op](source_key, entry):
+        pb_queue.push(op, source_key, queued)
+
+
+def _apply_queued(op: str, source_key: str, entry: dict | None) -> bool:
+    if entry is not None:
+        entry = entry_from_dict(PB_ENTRY_TYPES[op], entry)
+    return PB_WRITES[op](source_key, entry)
+
+
+def replay_pb_queue():
+    """Flush queued PocketBase writes if PocketBase is reachable again."""
+    if not len(pb_queue):
+        return
+    if pb.breaker.is_open and not pb.health_check():
+        return
+    pending = len(pb_queue)
+    applied = pb_queue.replay(_apply_queued, PB_QUEUE_BATCH)
+    log.info(f"PocketBase write queue: replayed {applied} of {pending} pending write(s)")
+
+
+def begin_scan() -> dict:
+    """Load state for a scan cycle, bootstrapping from PocketBase if empty."""
     log.info("Starting scan...")
 
     state = load_state()
 
+    # Apply writes queued while PocketBase was down before making new ones
+    replay_pb_queue()
+
+    # Pick up any newly dropped TMDb daily export (no-op once imported)
+    tmdb_index.import_new_exports(TMDB_EXPORT_DIR)
+
+    # On a first start with no state, the bootstrap may already be loading
+    pb_state = warmup.join("pocketbase")
+
     # If local state is empty but PocketBase has data, sync from PocketBase
     if not state.get("films") and not state.get("shows"):
-        pb_state = sync_state_from_pocketbase()
+        if pb_state is None:
+            pb_state = sync_state_from_pocketbase()
         if pb_state.get("films") or pb_state.get("shows"):
             log.info(f"Bootstrapped state from PocketBase: "
                      f"{len(pb_state.get('films', {}))} films, "
                      f"{len(pb_state.get('shows', {}))} shows")
             state = pb_state
+        else:
+            # PocketBase lost too: fall back to the last library snapshot
+            snap_state = state_from_library_snapshot()
+            if snap_state["films"] or snap_state["shows"]:
+                log.info(f"Bootstrapped state from the library snapshot: "
+                         f"{len(snap_state['films'])} films, {len(snap_state['shows'])} shows")
+                state = snap_state
+
+    return state
+
+
+def finish_scan(state: dict, started: float):
+    """Refresh stale TMDb records and persist state at the end of a scan."""
+    # Revalidate a bounded number of stale TMDb records; renames are picked
+    # up by the next scan
+    refreshed = refresh_stale_tmdb(TMDB_REFRESH_PER_SCAN)
+    if refreshed:
+        log.info(f"TMDb refresh: {refreshed} record(s) changed")
+
+    # Queued writes are durable before the state that assumes them
+    pb_queue.flush()
+    save_state(state)
+    scan_checkpoint.clear()
+    tmdb_cache.save()
+    listing_snapshot.save()
+    if listing_recorder:
+        listing_recorder.save()
+    try:
+        write_library_snapshot(state)
+    except OSError as e:
+        log.warning(f"Could not write the library snapshot: {e}")
+    replay_pb_queue()
+
+    total = len(state.get("films", {})) + len(state.get("shows", {}))
+    log.info(f"Scan complete in {time.monotonic() - started:.1f}s. Tracking {total} item(s) "
+             f"({len(state.get('films', {}))} films, {len(state.get('shows', {}))} shows), "
+             f"peak RSS {peak_rss_mib():.0f} MiB")
+
+
+def run_scan():
+    """Run a single scan cycle."""
+    started = time.monotonic()
+    state = begin_scan()
+    budget = ScanBudget(SCAN_BUDGET)
+
+    # An unreachable mount would look like every source was deleted
+    if not mount_health.probe([*state.get("films", {}), *state.get("shows", {})]):
+        log.warning("Zurg mount is not responding — skipping this scan")
+        return
 
     # Clean up broken symlinks first
     log.info("Checking for broken symlinks...")
     cleanup_broken_symlinks(FILMS_DIR)
     cleanup_broken_symlinks(SHOWS_DIR)
+    for profile in output_profiles:
+        cleanup_broken_symlinks(profile.root / FILMS_DIR.name)
+        cleanup_broken_symlinks(profile.root / SHOWS_DIR.name)
 
     # Purge state entries whose sources no longer exist
-    stale_films = [k for k in state.get("films", {}) if not Path(k).exists()]
+    stale_films = [k for k in state.get("films", {}) if not source_exists(k)]
     for k in stale_films:
-        pb_item = pb.get_film(k)
-        if pb_item:
-            pb.delete_film(pb_item["id"])
+        pb_write("forget_film", k)
         del state["films"][k]
 
-    stale_shows = [k for k in state.get("shows", {}) if not Path(k).exists()]
+    stale_shows = [k for k in state.get("shows", {}) if not source_exists(k)]
     for k in stale_shows:
-        pb_item = pb.get_show(k)
-        if pb_item:
-            pb.delete_show(pb_item["id"])
+        pb_write("forget_show", k)
         del state["shows"][k]
 
     # Process new content
     log.info("Processing films...")
-    state["films"] = process_films(state)
+    state["films"] = process_films(state, budget)
 
     log.info("Processing shows...")
-    state["shows"] = process_shows(state)
+    state["shows"] = process_shows(state, budget)
 
-    save_state(state)
+    report_mount_pacing()
+    finish_scan(state, started)
 
-    total = len(state.get("films", {})) + len(state.get("shows", {}))
-    log.info(f"Scan complete. Tracking {total} item(s) "
-             f"({len(state.get('films', {}))} films, {len(state.get('shows', {}))} shows)")
 
+# ---------------------------------------------------------------------------
+# Async scan core (ASYNC_SCAN=true)
+# ---------------------------------------------------------------------------
+
+class AsyncIO:
+    """Bounded per-service executors for the asyncio scan.
+
+    Blocking work (FUSE stats, TMDb and PocketBase requests) runs in one
+    thread pool per service, so each service has its own concurrency limit
+    and a hung mount can never starve the HTTP clients (or vice versa).
+    """
+
+    def __init__(self):
+        self._pools = {
+            "fs": ThreadPoolExecutor(ASYNC_FS_WORKERS, thread_name_prefix="fs"),
+            "tmdb": ThreadPoolExecutor(ASYNC_TMDB_CONCURRENCY, thread_name_prefix="tmdb"),
+            "pb": ThreadPoolExecutor(ASYNC_PB_CONCURRENCY, thread_name_prefix="pb"),
+        }
+        self._timeouts = {"fs": ASYNC_FS_TIMEOUT, "tmdb": 60, "pb": 60}
+
+    async def run(self, service: str, fn, *args, timeout: float | None = 0, **kwargs):
+        """Run fn in the service's pool; None if it exceeds the timeout.
+
+        timeout=0 means the service default, None means wait indefinitely.
+        """
+        if timeout == 0:
+            timeout = self._timeouts[service]
+        call = partial(fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pools[service], call)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"  {service}: {fn.__name__} timed out after {timeout}s")
+            return None
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _prefetch_lookups(aio: AsyncIO, search, parsed_titles: list[tuple],
+                            lookup_cache: dict):
+    """Resolve every distinct unresolved title concurrently into lookup_cache.
+
+    The first (title, year) seen for a title wins, exactly as in the
+    sequential scan, so the later candidate collection only hits the cache.
+    Lookups resolved so far are checkpointed as they complete, as the
+    sequential scan does between directories.
+    """
+    queries: dict[str, tuple] = {}
+    for title, year in parsed_titles:
+        queries.setdefault(title.lower(), (title, year))
+    for lookup in asyncio.as_completed([
+        aio.run("tmdb", search, title, year, _cache=lookup_cache)
+        for title, year in queries.values()
+    ]):
+        await lookup
+        scan_checkpoint.save_due()
+
+
+async def _reconcile_async(aio: AsyncIO, media_type: str, picks: list[tuple],
+                           processed: dict, resync: bool):
+    """Link picked sources and record the new or changed ones concurrently."""
+    await asyncio.gather(*(
+        aio.run("fs", link_source, video_path, target_file, processed.get(str(video_path)))
+        for video_path, target_file, _ in picks
+    ))
+    writes = [(video_path, entry) for video_path, _, entry in picks
+              if resync or entry != processed.get(str(video_path))]
+
+    # Resolve each title's PocketBase tmdb row once before the per-source
+    # upserts, so concurrent episodes never race to create the same row
+    titles: dict[int, FilmEntry | ShowEntry] = {}
+    for _, entry in writes:
+        if entry.tmdb_id is not None:
+            titles.setdefault(entry.tmdb_id, entry)
+    await asyncio.gather(*(
+        aio.run("pb", tmdb_cache.pocketbase_id, media_type, tmdb_id, entry.title, entry.year)
+        for tmdb_id, entry in titles.items()
+    ))
+    await asyncio.gather(*(
+        aio.run("pb", pb_write, media_type, str(video_path), entry)
+        for video_path, entry in writes
+    ))
+
+
+async def process_films_async(state: dict, aio: AsyncIO, budget: ScanBudget) -> dict:
+    """Async counterpart of process_films — same phases, concurrent I/O."""
+    processed = state.get("films", {})
+    video_files = await aio.run("fs", find_video_files, ZURG_FILMS, timeout=None)
+
+    if not video_files:
+        log.info("  No video files found in films directory")
+        return processed
+
+    lookup_cache: dict[str, dict] = {}
 
-def wait_for_pocketbase():
-    """Wait for PocketBase to become available."""
+    # Titles are resolved concurrently after the budgeted parse
+    parsed = schedule_parse("film", video_files, state, budget)
+    await _prefetch_lookups(aio, tmdb_search_film,
+                            [(p.title, p.year) for p in parsed if p.tmdb_id is None], lookup_cache)
+    candidates = collect_film_candidates(parsed, lookup_cache)
+
+    picks = list(select_films(candidates))
+    state.setdefault("seen", {})["films"] = seen_candidates(
+        "films", candidates, {str(video_path) for video_path, _, _ in picks})
+    resync = await aio.run("pb", pocketbase_behind, "films", processed)
+    await asyncio.gather(
+        _reconcile_async(aio, "film", picks, processed, bool(resync)),
+        aio.run("fs", link_profiles, "films", candidates, state, timeout=None),
+    )
+    return {str(video_path): entry for video_path, _, entry in picks}
+
+
+async def process_shows_async(state: dict, aio: AsyncIO, budget: ScanBudget) -> dict:
+    """Async counterpart of process_shows — same phases, concurrent I/O."""
+    processed = state.get("shows", {})
+    video_files = await aio.run("fs", find_video_files, ZURG_SHOWS, timeout=None)
+
+    if not video_files:
+        log.info("  No video files found in shows directory")
+        return processed
+
+    lookup_cache: dict[str, dict] = {}
+
+    parsed = schedule_parse("show", video_files, state, budget)
+    await _prefetch_lookups(aio, tmdb_search_tv,
+                            [(p.title, p.year) for p in parsed if p.tmdb_id is None], lookup_cache)
+    candidates = collect_show_candidates(parsed, lookup_cache)
+
+    picks = list(select_shows(candidates))
+    state.setdefault("seen", {})["shows"] = seen_candidates(
+        "shows", candidates, {str(video_path) for video_path, _, _ in picks})
+    resync = await aio.run("pb", pocketbase_behind, "shows", processed)
+    await asyncio.gather(
+        _reconcile_async(aio, "show", picks, processed, bool(resync)),
+        aio.run("fs", link_profiles, "shows", candidates, state, timeout=None),
+    )
+    return {str(video_path): entry for video_path, _, entry in picks}
+
+
+async def _purge_stale_async(aio: AsyncIO, state: dict):
+    """Drop state entries whose sources are gone, checking them concurrently."""
+    for media_type, key in (("film", "films"), ("show", "shows")):
+        sources = list(state.get(key, {}))
+        exists = await asyncio.gather(*(aio.run("fs", source_exists, k) for k in sources))
+        # A timed-out check (None) is not proof the source is gone
+        stale = [k for k, ok in zip(sources, exists) if ok is False]
+        await asyncio.gather(*(aio.run("pb", pb_write, f"forget_{media_type}", k) for k in stale))
+        for k in stale:
+            del state[key][k]
+
+
+async def _run_scan_async():
+    started = time.monotonic()
+    aio = AsyncIO()
+    try:
+        state = await asyncio.to_thread(begin_scan)
+        budget = ScanBudget(SCAN_BUDGET)
+
+        sources = [*state.get("films", {}), *state.get("shows", {})]
+        if not await aio.run("fs", mount_health.probe, sources, timeout=None):
+            log.warning("Zurg mount is not responding — skipping this scan")
+            return
+
+        log.info("Checking for broken symlinks...")
+        await asyncio.gather(*(
+            aio.run("fs", cleanup_broken_symlinks, root / directory.name, timeout=None)
+            for root in (MEDIA_DIR, *(profile.root for profile in output_profiles))
+            for directory in (FILMS_DIR, SHOWS_DIR)
+        ))
+        await _purge_stale_async(aio, state)
+
+        log.info("Processing films and shows...")
+        state["films"], state["shows"] = await asyncio.gather(
+            process_films_async(state, aio, budget),
+            process_shows_async(state, aio, budget),
+        )
+
+        report_mount_pacing()
+
+        await asyncio.to_thread(finish_scan, state, started)
+    finally:
+        aio.close()
+
+
+def run_scan_async():
+    """Run a single scan cycle on the asyncio core.
+
+    Produces the same state as run_scan; filesystem work runs in a bounded
+    executor and TMDb/PocketBase requests go through pooled sessions with
+    per-service concurrency limits, so their latencies overlap instead of
+    adding up.
+    """
+    asyncio.run(_run_scan_async())
+
+
+# ---------------------------------------------------------------------------
+# Startup warm-up (overlaps slow loading with the wait for the Zurg mount)
+# ---------------------------------------------------------------------------
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process in MiB (Linux reports KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Warmup:
+    """Named background jobs whose results the first scan joins when needed."""
+
+    def __init__(self):
+        self._threads: dict[str, threading.Thread] = {}
+        self._results: dict[str, object] = {}
+
+    def start(self, name: str, fn):
+        thread = threading.Thread(target=self._run, args=(name, fn),
+                                  name=f"warmup-{name}", daemon=True)
+        self._threads[name] = thread
+        thread.start()
+
+    def _run(self, name: str, fn):
+        start = time.monotonic()
+        try:
+            self._results[name] = fn()
+        except Exception as e:
+            log.warning(f"Warm-up {name} failed: {e}")
+            return
+        log.info(f"Warm-up: {name} ready in {time.monotonic() - start:.2f}s")
+
+    def join(self, name: str):
+        """Wait for a job if it was started; return its result (None otherwise)."""
+        thread = self._threads.pop(name, None)
+        if thread is None:
+            return None
+        thread.join()
+        return self._results.pop(name, None)
+
+
+warmup = Warmup()
+
+
+def wait_for_pocketbase(timeout: int = PB_STARTUP_WAIT):
+    """Wait briefly for PocketBase; scans run at full speed without it.
+
+    Writes made while PocketBase is down are queued and replayed once it
+    comes back, so there is no need to block startup on it.
+    """
     log.info(f"Waiting for PocketBase at {POCKETBASE_URL}...")
-    for attempt in range(60):
+    deadline = time.monotonic() + timeout
+    while True:
         if pb.health_check():
             log.info("PocketBase is ready")
             return True
-        time.sleep(2)
-    log.warning("PocketBase not available after 2 minutes, continuing without caching")
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(1)
+    log.warning(f"PocketBase not available after {timeout}s, "
+                "continuing — writes will be queued until it is back")
     return False
 
 
@@ -1019,8 +3623,14 @@ def main():
     log.info(f"  Jellyfin path:  {JELLYFIN_ZURG_PATH}")
     log.info(f"  Media output:   {MEDIA_DIR}")
     log.info(f"  TMDb API:       {'enabled' if TMDB_API_KEY else 'disabled (set TMDB_API_KEY for better naming)'}")
+    log.info(f"  TMDb exports:   {TMDB_EXPORT_DIR}")
     log.info(f"  PocketBase:     {POCKETBASE_URL}")
-    log.info(f"  Rebuild mode:   {REBUILD_MODE}")
+    log.info(f"  Rebuild mode:   {REBUILD_MODE}" + (f" (from {REBUILD_FROM})" if REBUILD_MODE else ""))
+    log.info(f"  Scan core:      {'asyncio' if ASYNC_SCAN else 'sync'}")
+    if listing_replay:
+        log.info(f"  Mount listing:  replay of {LISTING_REPLAY_FILE} (offline)")
+    else:
+        log.info(f"  Mount listing:  {'snapshot' if LISTING_SNAPSHOT else 'full walk every scan'}")
     log.info(f"  Scan interval:  {SCAN_INTERVAL}s")
     log.info("=" * 60)
 
@@ -1028,8 +3638,20 @@ def main():
     FILMS_DIR.mkdir(parents=True, exist_ok=True)
     SHOWS_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Wait for PocketBase
-    wait_for_pocketbase()
+    # Build guessit's rules in the background; rebuild/reseed never parse names
+    if not REBUILD_MODE and not RESEED_MODE:
+        warmup.start("guessit", _warm_guessit)
+
+    # Wait for PocketBase (rebuild and reseed read or write everything, so
+    # wait longer; a rebuild from the snapshot and a replay do not need it)
+    if not (REBUILD_MODE and REBUILD_FROM == "snapshot") and not listing_replay:
+        wait_for_pocketbase(120 if REBUILD_MODE or RESEED_MODE else PB_STARTUP_WAIT)
+
+    # Reseed mode: restore PocketBase from the library snapshot and exit
+    if RESEED_MODE:
+        run_reseed()
+        log.info("Reseed mode complete — exiting.")
+        return
 
     # Rebuild mode: recreate symlinks from PocketBase and exit
     if REBUILD_MODE:
@@ -1047,6 +3669,24 @@ def main():
         log.info("Rebuild mode complete — exiting.")
         return
 
+    # Replay mode: scan a recorded listing instead of the mount and exit
+    if listing_replay:
+        header = listing_replay.load()
+        recorded = time.strftime("%Y-%m-%d %H:%M", time.localtime(header.get("recorded_at", 0)))
+        log.info(f"Replaying {sum(map(len, listing_replay.listings.values()))} file(s) "
+                 f"recorded {recorded}" + (" (anonymised)" if header.get("anonymised") else "")
+                 + f" into {LISTING_REPLAY_DIR}, without PocketBase")
+        scan = run_scan_async if ASYNC_SCAN else run_scan
+        for _ in range(LISTING_REPLAY_SCANS):
+            scan()
+        log.info("Replay complete — exiting.")
+        return
+
+    # With no local state, load the bootstrap state from PocketBase in the
+    # background while waiting for the mount
+    if not STATE_FILE.exists():
+        warmup.start("pocketbase", sync_state_from_pocketbase)
+
     # Wait for Zurg mount to become available
     log.info("Waiting for Zurg mount...")
     for attempt in range(60):
@@ -1057,15 +3697,19 @@ def main():
     else:
         log.warning("Zurg mount not detected after 5 minutes, starting anyway")
 
+    # guessit keeps warming up; the first name that needs parsing waits for it
+    scan = run_scan_async if ASYNC_SCAN else run_scan
+    log.info(f"Ready in {time.monotonic() - STARTED_AT:.2f}s (peak RSS {peak_rss_mib():.0f} MiB)")
+
     # Initial scan
-    run_scan()
+    scan()
 
     # Continuous loop
     while True:
         log.info(f"Next scan in {SCAN_INTERVAL}s...")
         time.sleep(SCAN_INTERVAL)
         try:
-            run_scan()
+            scan()
         except Exception as e:
             log.error(f"Scan failed: {e}", exc_info=True)
 
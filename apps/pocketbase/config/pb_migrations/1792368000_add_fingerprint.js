@@ -0,0 +1,29 @@
+/// <reference path="../pb_data/types.d.ts" />
+
+// PocketBase migration: add a source fingerprint to films and shows.
+// The organiser stores "<size>:<mtime>" of each source file here so it can
+// tell a replaced file (Zurg repair, torrent re-add) from an unchanged one,
+// including after its local state has been rebuilt from PocketBase.
+
+migrate(
+    (app) => {
+        for (const name of ["films", "shows"]) {
+            const col = app.findCollectionByNameOrId(name);
+            col.fields.add(new TextField({
+                name: "fingerprint",
+                required: false,
+            }));
+            app.save(col);
+        }
+    },
+    (app) => {
+        // Rollback
+        for (const name of ["films", "shows"]) {
+            try {
+                const col = app.findCollectionByNameOrId(name);
+                col.fields.removeByName("fingerprint");
+                app.save(col);
+            } catch (_) { }
+        }
+    }
+);
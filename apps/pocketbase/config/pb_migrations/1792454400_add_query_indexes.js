@@ -0,0 +1,41 @@
+/// <reference path="../pb_data/types.d.ts" />
+
+// PocketBase migration: index the columns library queries filter on.
+// "All episodes of show X season N", "which sources map to this target" and
+// "films below score N" otherwise scan the whole collection. The organiser
+// uses the target_path indexes to drop mappings of replaced copies.
+
+const INDEXES = {
+    films: [
+        ["idx_films_target", "target_path"],
+        ["idx_films_score", "score"],
+    ],
+    shows: [
+        ["idx_shows_episode", "tmdb, season, episode"],
+        ["idx_shows_target", "target_path"],
+    ],
+};
+
+migrate(
+    (app) => {
+        for (const [name, indexes] of Object.entries(INDEXES)) {
+            const col = app.findCollectionByNameOrId(name);
+            for (const [index, columns] of indexes) {
+                col.addIndex(index, false, columns, "");
+            }
+            app.save(col);
+        }
+    },
+    (app) => {
+        // Rollback
+        for (const [name, indexes] of Object.entries(INDEXES)) {
+            try {
+                const col = app.findCollectionByNameOrId(name);
+                for (const [index] of indexes) {
+                    col.removeIndex(index);
+                }
+                app.save(col);
+            } catch (_) { }
+        }
+    }
+);